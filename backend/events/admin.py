@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Category, Event, Ticket
+from .models import Category, Event, Ticket, OutboundEmail
 
 # Register your models here.
 
@@ -9,8 +9,15 @@ class CategoryAdmin(admin.ModelAdmin):
 
 @admin.register(Event)
 class EventAdmin(admin.ModelAdmin):
-    list_display = ['id', 'title', 'location_name', 'category', 'date', 'created_by', 'views']
+    list_display = ['id', 'title', 'location_name', 'category', 'date', 'created_by', 'views', 'attendee_count']
+    # Event.save() never writes the counters
+    readonly_fields = ['views']
 
 @admin.register(Ticket)
 class TicketAdmin(admin.ModelAdmin):
     list_display = ['id', 'event', 'price', 'quantity', 'sold']
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ['id', 'to_email', 'subject', 'status', 'attempts', 'next_attempt_at', 'sent_at']
+    list_filter = ['status']
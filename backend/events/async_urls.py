@@ -0,0 +1,10 @@
+from django.urls import path
+
+from . import async_views
+
+urlpatterns = [
+    path('events/', async_views.event_list),
+    path('events/nearby/', async_views.event_nearby),
+    path('events/trending/', async_views.event_trending),
+    path('events/<int:pk>/', async_views.event_detail),
+]
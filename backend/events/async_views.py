@@ -0,0 +1,156 @@
+"""Async versions of the busiest read endpoints, served under ``/api/async/``.
+
+Under an ASGI server these run on the event loop and query through Django's
+async ORM, so a worker is not tied up while a request waits on the database
+or a slow client. They return the same responses as the ``EventViewSet``
+actions they mirror (``list``, ``retrieve``, ``nearby`` and ``trending``):
+the queryset, filtering, pagination, serialization and response caching are
+the viewset's own, as are its permission and throttle checks. Authentication
+needs no query, as ``LazyJWTAuthentication`` reads the user from the token.
+Only ``GET`` and ``HEAD`` are served; anything else gets a JSON ``405``.
+"""
+import functools
+
+from asgiref.sync import sync_to_async
+from django.http import Http404
+from django.utils import timezone
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import APIException, MethodNotAllowed
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import exception_handler
+
+from .caching import event_scope, resolve_scopes, response_cache
+from .models import Event
+from .renderers import FastJSONRenderer
+from .search import ranked_event_ids
+from .serializers import EventListSerializer, EventSerializer
+from .tracking import view_counter
+from .trending import leaderboard
+from .views import EventViewSet, nearby_keys, nearby_query, trending_limit
+
+ALLOWED_METHODS = ('GET', 'HEAD')
+
+
+def async_api_view(action, scopes=()):
+    """Run an async view as the ``EventViewSet`` ``action``, rendering its ``Response`` as JSON.
+
+    The view receives a viewset set up for the request, for its queryset,
+    paginator and serializers. Anonymous responses are cached under
+    ``scopes``, as ``cache_response`` does for the viewset, and API
+    exceptions become the same error responses DRF would send. Like DRF's
+    own views these are exempt from CSRF checks, which only matter for the
+    methods refused here.
+    """
+    def decorator(view):
+        @csrf_exempt
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            authenticators = [auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+            request = Request(request, authenticators=authenticators)
+            viewset = EventViewSet(request=request, args=args, kwargs=kwargs, format_kwarg=None,
+                                   action=action, headers={})
+            try:
+                if request.method not in ALLOWED_METHODS:
+                    raise MethodNotAllowed(request.method)
+                # Reads the token only; raises here for an invalid one
+                request.user
+                viewset.check_permissions(request)
+                viewset.check_throttles(request)
+                response = await response_cache.aserve(
+                    request, resolve_scopes(scopes, kwargs), lambda: view(viewset, request, *args, **kwargs)
+                )
+            except (APIException, Http404) as exc:
+                if isinstance(exc, APIException) and exc.status_code == status.HTTP_401_UNAUTHORIZED:
+                    exc.auth_header = viewset.get_authenticate_header(request)
+                response = exception_handler(exc, {'view': viewset, 'request': request})
+                if isinstance(exc, MethodNotAllowed):
+                    response['Allow'] = ', '.join(ALLOWED_METHODS)
+            return render(response)
+        return wrapper
+    return decorator
+
+
+def render(response):
+    response.accepted_renderer = FastJSONRenderer()
+    response.accepted_media_type = FastJSONRenderer.media_type
+    response.renderer_context = {}
+    # 304s from the response cache carry no body
+    if isinstance(response, Response):
+        response.render()
+    return response
+
+
+async def event_rows(viewset, ids):
+    """``EventViewSet.event_rows`` for async views"""
+    queryset = EventListSerializer.rows(viewset.get_queryset().filter(pk__in=ids))
+    rows = {row['id']: row async for row in queryset}
+    return [rows[event_id] for event_id in ids if event_id in rows]
+
+
+def list_data(viewset, rows):
+    return viewset.get_serializer(rows, many=True).data
+
+
+@async_api_view('list', scopes=('events',))
+async def event_list(viewset, request):
+    paginator = viewset.paginator
+    # Validating filters such as created_by, and the search ranking, query the database
+    queryset = await sync_to_async(viewset.filter_queryset)(viewset.get_queryset())
+    ranked_ids = await sync_to_async(ranked_event_ids)(request, queryset.db)
+    if ranked_ids is None:
+        page = await paginator.apaginate_queryset(EventListSerializer.rows(queryset), request, viewset)
+        return paginator.get_paginated_response(list_data(viewset, page))
+
+    matching = {event_id async for event_id in queryset.values_list('pk', flat=True)}
+    keyed = [((position, event_id), event_id)
+             for position, event_id in enumerate(ranked_ids) if event_id in matching]
+    page = paginator.paginate_keys(keyed, request)
+    return paginator.get_paginated_response(list_data(viewset, await event_rows(viewset, page)))
+
+
+@csrf_exempt
+async def event_detail(request, pk):
+    response = await cached_event_detail(request, pk=pk)
+    # Counted exactly as EventViewSet.retrieve counts
+    if request.method == 'GET' and response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+        await sync_to_async(view_counter.record)(int(pk))
+    return response
+
+
+@async_api_view('retrieve', scopes=('events', event_scope))
+async def cached_event_detail(viewset, request, pk):
+    try:
+        event = await viewset.get_queryset().aget(pk=pk)
+    except Event.DoesNotExist:
+        raise Http404(f'No {Event._meta.object_name} matches the given query.')
+    return Response(EventSerializer(event, context=viewset.get_serializer_context()).data)
+
+
+@async_api_view('trending', scopes=('events', 'trending'))
+async def event_trending(viewset, request):
+    try:
+        limit = trending_limit(request.query_params)
+    except ValueError as exc:
+        return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+    # Rebuilds the leaderboard first if it is missing
+    ranked_ids = await sync_to_async(leaderboard.top)(leaderboard.size, request.query_params.get('category'))
+    now = timezone.now()
+    trending_events = [row for row in await event_rows(viewset, ranked_ids) if row['date'] >= now][:limit]
+    return Response(list_data(viewset, trending_events))
+
+
+@async_api_view('nearby')
+async def event_nearby(viewset, request):
+    try:
+        lat, lon, radius, filters = nearby_query(request.query_params)
+    except ValueError as exc:
+        return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+    # In memory, but catching up with other workers' changes may query
+    keyed = await sync_to_async(nearby_keys)(lat, lon, radius, filters, request.query_params.get('ordering'))
+    page = viewset.paginator.paginate_keys(keyed, request)
+    return viewset.paginator.get_paginated_response(list_data(viewset, await event_rows(viewset, page)))
@@ -0,0 +1,198 @@
+"""Response caching for anonymous reads.
+
+Cached views declare the data *scopes* they depend on (``'events'``,
+``'event_details'``, ``'categories'``, ``'trending'``). Each scope has a generation number in the
+cache, and every response key embeds the current generations, so bumping a
+scope on write makes all dependent entries unreachable at once; they simply
+age out. Signals bump scopes when models change (after the transaction
+commits), and code that writes with ``QuerySet.update()`` calls
+``response_cache.invalidate()`` itself: ``'event_details'`` as well as
+``'events'`` for changes to what registered users see of an event.
+
+Scopes can also be functions of the view's URL arguments: event details
+depend on their own ``event_scope``, so flushing one event's view count only
+drops that event's entries.
+
+Responses are shared between anonymous requests. Views cached ``per_user``
+instead keep one entry per authenticated user, which also depends on that
+user's own scope (``user_scope``), so one user's writes leave everyone else's
+entries alone.
+
+Misses are built from the primary database, even in requests that read from
+the replicas, so a lagging replica never fills the cache with data older than
+the generation it is stored under.
+
+Each cached response carries an ETag derived from its key and the time it was
+built as Last-Modified, so clients revalidate with ``If-None-Match`` or
+``If-Modified-Since`` and get a 304 without a body.
+
+Generations live in the ``RESPONSE_CACHE_ALIAS`` cache. With the default
+local-memory backend they are per process, which suits a single worker;
+set ``REDIS_URL`` so that every worker sees the same generations.
+"""
+import functools
+import hashlib
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from local_event.database import read_primary
+
+
+def user_scope(user_id):
+    return f'user:{user_id}'
+
+
+def event_scope(pk):
+    try:
+        # URL arguments are strings; the view counter passes ints
+        pk = int(pk)
+    except (TypeError, ValueError):
+        pass
+    return f'event:{pk}'
+
+
+def resolve_scopes(scopes, kwargs):
+    """Call the scopes that are functions with the view's URL arguments"""
+    return tuple(scope(**kwargs) if callable(scope) else scope for scope in scopes)
+
+
+class ResponseCache:
+    key_prefix = 'responses'
+
+    def __init__(self, cache_alias='default', timeout=600):
+        self.cache_alias = cache_alias
+        self.timeout = timeout
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def generation_key(self, scope):
+        return f'{self.key_prefix}:generation:{scope}'
+
+    def generations(self, scopes):
+        keys = [self.generation_key(scope) for scope in scopes]
+        found = self.cache.get_many(keys)
+        for key in keys:
+            if key not in found:
+                # Start from the clock, not 0, so a generation lost to eviction
+                # cannot come back and revive entries written under it
+                self.cache.add(key, time.time_ns(), timeout=None)
+                found[key] = self.cache.get(key)
+        return [found[key] for key in keys]
+
+    def invalidate(self, *scopes):
+        """Bump ``scopes`` once the current transaction commits"""
+        transaction.on_commit(lambda: self._bump(scopes))
+
+    def _bump(self, scopes):
+        for scope in scopes:
+            key = self.generation_key(scope)
+            try:
+                self.cache.incr(key)
+            except ValueError:
+                self.cache.set(key, time.time_ns(), timeout=None)
+
+    def key(self, request, scopes, user_id=None):
+        # Parameter order does not change the response, so it must not change the key
+        params = sorted(request.query_params.lists())
+        generations = self.generations(scopes)
+        digest = hashlib.sha1(repr((request.path, params, generations, user_id)).encode()).hexdigest()
+        return f'{self.key_prefix}:{digest}'
+
+    def cacheable(self, request, per_user):
+        if request.method not in ('GET', 'HEAD'):
+            return False
+        # Shared entries are only for anonymous requests, per-user ones only for users
+        return request.user.is_authenticated == per_user
+
+    def serve(self, request, scopes, build, per_user=False):
+        """Return the cached response for ``request``, calling ``build`` on a miss"""
+        if not self.cacheable(request, per_user):
+            return build()
+
+        key, entry = self.lookup(request, scopes, per_user)
+        if entry is None:
+            with read_primary():
+                response = build()
+            if response.status_code != 200:
+                return response
+            entry = self.store(key, response.data)
+        else:
+            response = Response(entry['data'])
+        return self.revalidate(request, response, key, entry, per_user)
+
+    async def aserve(self, request, scopes, build, per_user=False):
+        """``serve`` for async views; ``build`` is a coroutine function"""
+        if not self.cacheable(request, per_user):
+            return await build()
+
+        key, entry = await sync_to_async(self.lookup)(request, scopes, per_user)
+        if entry is None:
+            # The async ORM's worker threads inherit the routing
+            with read_primary():
+                response = await build()
+            if response.status_code != 200:
+                return response
+            entry = await sync_to_async(self.store)(key, response.data)
+        else:
+            response = Response(entry['data'])
+        return self.revalidate(request, response, key, entry, per_user)
+
+    def lookup(self, request, scopes, per_user=False):
+        if per_user:
+            # The id comes from the token; no user query
+            user_id = request.user.id
+            key = self.key(request, (*scopes, user_scope(user_id)), user_id)
+        else:
+            key = self.key(request, scopes)
+        return key, self.cache.get(key)
+
+    def store(self, key, data):
+        entry = {'data': data, 'last_modified': int(time.time())}
+        self.cache.set(key, entry, timeout=self.timeout)
+        return entry
+
+    def revalidate(self, request, response, key, entry, private=False):
+        response['ETag'] = f'"{key.rsplit(":", 1)[1]}"'
+        response['Last-Modified'] = http_date(entry['last_modified'])
+        # Always revalidate; a 304 is cheap and never stale
+        patch_cache_control(response, no_cache=True)
+        if private:
+            # Browsers may keep it, shared caches must not
+            patch_cache_control(response, private=True)
+        patch_vary_headers(response, ['Authorization'])
+        return get_conditional_response(
+            request, etag=response['ETag'], last_modified=entry['last_modified'], response=response
+        )
+
+
+response_cache = ResponseCache(
+    cache_alias=getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default'),
+    timeout=getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 600),
+)
+
+
+def cache_response(*scopes, per_user=False):
+    """Cache a view method's anonymous GET responses until ``scopes`` change.
+
+    With ``per_user``, cache each authenticated user's responses instead,
+    until ``scopes`` or the user's own scope change. Scopes that are functions,
+    like ``event_scope``, are called with the URL arguments.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            return response_cache.serve(
+                request, resolve_scopes(scopes, kwargs), lambda: method(self, request, *args, **kwargs),
+                per_user=per_user,
+            )
+        return wrapper
+    return decorator
@@ -0,0 +1,33 @@
+from django.core import checks
+
+
+def _readable(serializer):
+    return {name for name, field in serializer.fields.items() if not field.write_only}
+
+
+@checks.register()
+def check_event_list_fields(app_configs, **kwargs):
+    """``EventListSerializer`` builds events by hand; fail if they drift from ``EventSerializer``"""
+    from users.serializers import UserSerializer
+    from .serializers import CategorySerializer, EventListSerializer, EventSerializer
+
+    row = dict.fromkeys(EventListSerializer.value_fields)
+    row.update({'latitude': 0, 'longitude': 0, 'category__id': 0, 'image_variants': {}})
+    event = EventListSerializer(child=EventSerializer()).to_representation([row])[0]
+
+    errors = []
+    for name, built, serializer in [
+        ('event', event, EventSerializer()),
+        ('category', event['category'], CategorySerializer()),
+        ('created_by', event['created_by'], UserSerializer()),
+    ]:
+        expected = _readable(serializer)
+        if set(built) != expected:
+            errors.append(checks.Error(
+                f'EventListSerializer renders {name} with fields {sorted(built)}, '
+                f'but {type(serializer).__name__} has {sorted(expected)}',
+                hint='Update EventListSerializer.value_fields and to_representation to match.',
+                obj='events.serializers.EventListSerializer',
+                id='events.E001',
+            ))
+    return errors
@@ -0,0 +1,32 @@
+from django.conf import settings
+
+from .models import OutboundEmail
+
+
+def queue_registration_confirmation(registration):
+    """Write the confirmation email for ``registration`` to the outbox.
+
+    Call inside the transaction that creates the registration so the email
+    exists if and only if the registration does.
+    """
+    event = registration.event
+    return OutboundEmail.objects.create(
+        registration=registration,
+        to_email=registration.attendee_email,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        subject=f'Registration Confirmation - {event.title}',
+        body=f'''Dear {registration.attendee_name},
+
+Thank you for registering for {event.title}!
+
+Event Details:
+- Event: {event.title}
+- Date: {event.date.strftime("%B %d, %Y at %I:%M %p")}
+- Location: {event.location_name}
+
+We look forward to seeing you there!
+
+Best regards,
+The Events Team
+''',
+    )
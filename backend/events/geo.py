@@ -0,0 +1,181 @@
+"""Geohash helpers used to index events by location and answer radius queries.
+
+Each event stores the geohash of its coordinates, which ``events.hotset``
+partitions upcoming events by. A radius query is turned into a small set of
+geohash cells covering its bounding box, the hot set's partitions under those
+cells give the candidates, and they are refined with an exact haversine
+distance.
+"""
+import math
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.0
+
+# Precision stored on Event.geohash (~4.8m x 4.8m cells)
+GEOHASH_PRECISION = 9
+
+# Upper bound on the number of cells a single query may expand to
+MAX_COVER_CELLS = 32
+
+
+def encode(lat, lon, precision=GEOHASH_PRECISION):
+    """Encode a coordinate pair as a geohash string"""
+    lat_lo, lat_hi = -90.0, 90.0
+    lon_lo, lon_hi = -180.0, 180.0
+    chars = []
+    bit = 0
+    ch = 0
+    even = True
+    while len(chars) < precision:
+        if even:
+            mid = (lon_lo + lon_hi) / 2
+            if lon >= mid:
+                ch = (ch << 1) | 1
+                lon_lo = mid
+            else:
+                ch <<= 1
+                lon_hi = mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if lat >= mid:
+                ch = (ch << 1) | 1
+                lat_lo = mid
+            else:
+                ch <<= 1
+                lat_hi = mid
+        even = not even
+        bit += 1
+        if bit == 5:
+            chars.append(BASE32[ch])
+            bit = 0
+            ch = 0
+    return ''.join(chars)
+
+
+def cell_size(precision):
+    """Return the (lat, lon) size in degrees of a cell at ``precision``"""
+    bits = precision * 5
+    lon_bits = (bits + 1) // 2
+    lat_bits = bits // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lon_bits)
+
+
+def bounding_box(lat, lon, radius_km):
+    """Return (min_lat, max_lat, min_lon, max_lon) around a point.
+
+    A circle that reaches a pole spans every longitude.
+    """
+    distance = radius_km / EARTH_RADIUS_KM
+    lat_delta = math.degrees(distance)
+    min_lat, max_lat = lat - lat_delta, lat + lat_delta
+    if min_lat <= -90.0 or max_lat >= 90.0:
+        return max(min_lat, -90.0), min(max_lat, 90.0), -180.0, 180.0
+    # Widest point of the circle, which lies poleward of its centre
+    lon_delta = math.degrees(math.asin(math.sin(distance) / math.cos(math.radians(lat))))
+    return min_lat, max_lat, lon - lon_delta, lon + lon_delta
+
+
+def _lon_ranges(min_lon, max_lon):
+    """Split a longitude range that crosses the antimeridian into two"""
+    if max_lon - min_lon >= 360.0:
+        return [(-180.0, 180.0)]
+    ranges = []
+    if min_lon < -180.0:
+        ranges.append((min_lon + 360.0, 180.0))
+        min_lon = -180.0
+    if max_lon > 180.0:
+        ranges.append((-180.0, max_lon - 360.0))
+        max_lon = 180.0
+    ranges.append((min_lon, max_lon))
+    return ranges
+
+
+def _steps(lo, hi, size, origin):
+    """First and last grid index of cells of ``size`` spanning [lo, hi].
+
+    The grid runs from ``origin`` to ``-origin``; ``hi`` is nudged below the
+    upper edge so a box touching +90/+180 does not spill into a phantom cell.
+    """
+    first = math.floor((lo - origin) / size)
+    last = math.floor((min(hi, -origin - 1e-9) - origin) / size)
+    return first, last
+
+
+def _cover_count(box, precision):
+    min_lat, max_lat, min_lon, max_lon = box
+    lat_size, lon_size = cell_size(precision)
+    lat_first, lat_last = _steps(min_lat, max_lat, lat_size, -90.0)
+    lat_cells = lat_last - lat_first + 1
+    lon_cells = 0
+    for lo, hi in _lon_ranges(min_lon, max_lon):
+        lon_first, lon_last = _steps(lo, hi, lon_size, -180.0)
+        lon_cells += lon_last - lon_first + 1
+    return lat_cells * lon_cells
+
+
+def precision_for_box(box, max_cells=MAX_COVER_CELLS):
+    """Pick the finest precision whose cover of ``box`` stays under ``max_cells``"""
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        if _cover_count(box, precision) <= max_cells:
+            return precision
+    return 1
+
+
+def cover(box, precision=None):
+    """Return the sorted geohash prefixes that together cover ``box``"""
+    if precision is None:
+        precision = precision_for_box(box)
+    min_lat, max_lat, min_lon, max_lon = box
+    lat_size, lon_size = cell_size(precision)
+    lat_first, lat_last = _steps(min_lat, max_lat, lat_size, -90.0)
+    cells = set()
+    for lo, hi in _lon_ranges(min_lon, max_lon):
+        lon_first, lon_last = _steps(lo, hi, lon_size, -180.0)
+        for i in range(lat_first, lat_last + 1):
+            cell_lat = -90.0 + (i + 0.5) * lat_size
+            for j in range(lon_first, lon_last + 1):
+                cell_lon = -180.0 + (j + 0.5) * lon_size
+                cells.add(encode(cell_lat, cell_lon, precision))
+    return sorted(cells)
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance between two points in kilometres"""
+    dlat = math.radians(lat2 - lat1)
+    dlon = math.radians(lon2 - lon1)
+    a = (math.sin(dlat / 2) ** 2 +
+         math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) *
+         math.sin(dlon / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def refine(lat, lon, radius_km, ids, lats, lons):
+    """Filter candidate columns down to those within ``radius_km`` of a point.
+
+    Works over parallel id/lat/lon sequences in a single pass, rejects points
+    outside the latitude band before doing any trigonometry, and returns
+    ``(distance_km, id)`` pairs sorted by distance.
+    """
+    radians = math.radians
+    sin = math.sin
+    cos = math.cos
+    origin_lat = radians(lat)
+    origin_lon = radians(lon)
+    cos_origin = cos(origin_lat)
+    max_dlat = radius_km / EARTH_RADIUS_KM
+    # Compare squared half-chord lengths instead of distances inside the loop
+    limit = sin(min(max_dlat, math.pi) / 2) ** 2
+
+    hits = []
+    for event_id, event_lat, event_lon in zip(ids, lats, lons):
+        phi = radians(event_lat)
+        dlat = phi - origin_lat
+        if dlat > max_dlat or -dlat > max_dlat:
+            continue
+        dlon = radians(event_lon) - origin_lon
+        a = sin(dlat / 2) ** 2 + cos_origin * cos(phi) * sin(dlon / 2) ** 2
+        if a <= limit:
+            hits.append((2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a))), event_id))
+    hits.sort()
+    return hits
@@ -0,0 +1,249 @@
+"""In-process hot set of upcoming events.
+
+Almost every location query is about future events, so each worker keeps the
+upcoming ones in memory and selects ``nearby`` candidates without a query.
+Events are partitioned by their geohash cell at ``precision`` characters, and
+each partition stores parallel ``array`` columns of ids, coordinates, start
+times and category ids, about 40 bytes per event.
+
+Saves and deletes are recorded as numbered changes in the
+``UPCOMING_EVENTS_CACHE_ALIAS`` cache. Before answering, a worker applies the
+changes it has not seen yet by reloading only the events concerned. Every
+``reconcile_interval`` seconds, or when changes are missing from the cache,
+it reloads the whole set instead, which also drops events that have started;
+in between they are skipped when answering. Writes that send no signals
+(``bulk_create``, ``update()``) show up at the next reconcile, as do other
+processes' changes when the cache is per process. Rows are always read from
+the primary: a replica that has not caught up with a recorded change would
+leave it out of the set until the next reconcile.
+"""
+import math
+import threading
+import time
+from array import array
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils import timezone
+
+from . import geo
+from .models import Category, Event
+
+# More changes than this since a worker last looked are cheaper to reload in full
+MAX_PENDING_CHANGES = 500
+
+# Recorded instead of event ids when everything must be reloaded
+EVERYTHING = '*'
+
+
+class Partition:
+    """The upcoming events of one geohash cell, as parallel columns"""
+    __slots__ = ('ids', 'lats', 'lons', 'starts', 'categories')
+
+    def __init__(self):
+        self.ids = array('q')
+        self.lats = array('d')
+        self.lons = array('d')
+        # Start times as POSIX timestamps
+        self.starts = array('d')
+        # 0 for events without a category
+        self.categories = array('q')
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, event_id, lat, lon, start, category_id):
+        self.ids.append(event_id)
+        self.lats.append(lat)
+        self.lons.append(lon)
+        self.starts.append(start)
+        self.categories.append(category_id or 0)
+
+    def remove(self, event_id):
+        # Rows are unordered, so the last one fills the gap
+        index = self.ids.index(event_id)
+        for column in (self.ids, self.lats, self.lons, self.starts, self.categories):
+            column[index] = column[-1]
+            column.pop()
+
+
+class UpcomingEvents:
+    key_prefix = 'upcoming_events'
+
+    def __init__(self, cache_alias='default', precision=4, reconcile_interval=300):
+        self.cache_alias = cache_alias
+        self.precision = precision
+        self.reconcile_interval = reconcile_interval
+        # Guards the partitions; held only briefly, never across a query
+        self._lock = threading.Lock()
+        # Held by the one thread reloading everything
+        self._reloading = threading.Lock()
+        self._partitions = {}
+        self._cells = {}
+        self._categories = {}
+        self._seen = None
+        self._reconciled_at = None
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    @property
+    def sequence_key(self):
+        return f'{self.key_prefix}:sequence'
+
+    def change_key(self, sequence):
+        return f'{self.key_prefix}:change:{sequence}'
+
+    def sequence(self):
+        """Number of the latest recorded change"""
+        sequence = self.cache.get(self.sequence_key)
+        if sequence is None:
+            # Start from the clock, like response generations, so a counter
+            # lost to eviction never repeats numbers a worker has seen
+            self.cache.add(self.sequence_key, time.time_ns(), timeout=None)
+            sequence = self.cache.get(self.sequence_key)
+        return sequence
+
+    def changed(self, event_ids=EVERYTHING):
+        """Record that ``event_ids`` changed, once the current transaction commits"""
+        transaction.on_commit(lambda: self._record(event_ids))
+
+    def _record(self, event_ids):
+        self.sequence()
+        try:
+            sequence = self.cache.incr(self.sequence_key)
+        except ValueError:
+            # Evicted just now; every worker will reload in full
+            return
+        # Workers that have not caught up by then reconcile anyway
+        self.cache.set(self.change_key(sequence), event_ids, timeout=self.reconcile_interval)
+
+    def rows(self, queryset):
+        return queryset.values_list('id', 'geohash', 'latitude', 'longitude', 'date', 'category_id')
+
+    def _add(self, partitions, cells, event_id, geohash, lat, lon, date, category_id):
+        cell = geohash[:self.precision] or geo.encode(lat, lon, self.precision)
+        partition = partitions.get(cell)
+        if partition is None:
+            partition = partitions[cell] = Partition()
+        partition.add(event_id, lat, lon, date.timestamp(), category_id)
+        cells[event_id] = cell
+
+    def _discard(self, event_id):
+        cell = self._cells.pop(event_id, None)
+        if cell is not None:
+            partition = self._partitions[cell]
+            partition.remove(event_id)
+            if not partition:
+                del self._partitions[cell]
+
+    def reconcile(self, sequence=None):
+        """Reload every upcoming event from the database and return how many there are"""
+        # Read first: changes recorded while loading are applied again afterwards
+        if sequence is None:
+            sequence = self.sequence()
+        partitions = {}
+        cells = {}
+        categories = dict(Category.objects.using(DEFAULT_DB_ALIAS).exclude(slug=None).values_list('slug', 'id'))
+        upcoming = Event.objects.using(DEFAULT_DB_ALIAS).filter(date__gte=timezone.now())
+        for row in self.rows(upcoming).iterator(chunk_size=2000):
+            self._add(partitions, cells, *row)
+
+        with self._lock:
+            self._partitions = partitions
+            self._cells = cells
+            self._categories = categories
+            self._seen = sequence
+            self._reconciled_at = time.monotonic()
+        return len(cells)
+
+    def refresh(self):
+        """Apply the changes this worker has not seen, or reload when due"""
+        latest = self.sequence()
+        if self._seen is None:
+            # Nothing to answer from yet
+            with self._reloading:
+                if self._seen is None:
+                    self.reconcile(latest)
+            return
+
+        due = time.monotonic() - self._reconciled_at >= self.reconcile_interval
+        if not due and 0 <= latest - self._seen <= MAX_PENDING_CHANGES:
+            if latest == self._seen or self._apply(self._seen, latest):
+                return
+        # One thread reloads while the others answer from the current set
+        if self._reloading.acquire(blocking=False):
+            try:
+                self.reconcile(latest)
+            finally:
+                self._reloading.release()
+
+    def _apply(self, seen, latest):
+        """Reload the events changed after ``seen``; False if the changes are not all known"""
+        keys = [self.change_key(sequence) for sequence in range(seen + 1, latest + 1)]
+        changes = self.cache.get_many(keys)
+        if len(changes) < len(keys) or EVERYTHING in changes.values():
+            return False
+
+        event_ids = set()
+        for ids in changes.values():
+            event_ids.update(ids)
+        changed = Event.objects.using(DEFAULT_DB_ALIAS).filter(pk__in=event_ids, date__gte=timezone.now())
+        rows = list(self.rows(changed))
+        with self._lock:
+            # Unless another thread applied them, or reloaded, meanwhile
+            if self._seen == seen:
+                for event_id in event_ids:
+                    self._discard(event_id)
+                for row in rows:
+                    self._add(self._partitions, self._cells, *row)
+                self._seen = latest
+        return True
+
+    def _partitions_for(self, box):
+        if box is None:
+            return list(self._partitions.values())
+        precision = min(geo.precision_for_box(box), self.precision)
+        prefixes = geo.cover(box, precision)
+        if precision == self.precision:
+            return [self._partitions[cell] for cell in prefixes if cell in self._partitions]
+        prefixes = tuple(prefixes)
+        return [partition for cell, partition in self._partitions.items() if cell.startswith(prefixes)]
+
+    def candidates(self, box=None, category=None, after=None, before=None):
+        """Return ``(ids, lats, lons, starts)`` of upcoming events, as parallel lists.
+
+        ``box`` is a ``geo.bounding_box``; events in cells that overlap it are
+        returned, for ``geo.refine`` to filter exactly. ``category`` is a slug.
+        ``after`` and ``before`` are datetimes bounding the start time; events
+        that have already started are never returned.
+        """
+        self.refresh()
+        now = timezone.now().timestamp()
+        start = now if after is None else max(after.timestamp(), now)
+        end = math.inf if before is None else before.timestamp()
+
+        ids, lats, lons, starts = [], [], [], []
+        with self._lock:
+            if category is not None:
+                category_id = self._categories.get(category)
+                if category_id is None:
+                    return ids, lats, lons, starts
+            for partition in self._partitions_for(box):
+                rows = zip(partition.ids, partition.lats, partition.lons, partition.starts, partition.categories)
+                for event_id, lat, lon, when, event_category in rows:
+                    if start <= when < end and (category is None or event_category == category_id):
+                        ids.append(event_id)
+                        lats.append(lat)
+                        lons.append(lon)
+                        starts.append(when)
+        return ids, lats, lons, starts
+
+
+upcoming_events = UpcomingEvents(
+    cache_alias=getattr(settings, 'UPCOMING_EVENTS_CACHE_ALIAS', 'default'),
+    precision=getattr(settings, 'UPCOMING_EVENTS_CELL_PRECISION', 4),
+    reconcile_interval=getattr(settings, 'UPCOMING_EVENTS_RECONCILE_INTERVAL', 300),
+)
@@ -0,0 +1,130 @@
+"""Responsive variants of event images.
+
+Every uploaded image is re-encoded with Pillow at a few fixed widths in WebP,
+plus AVIF when the installed Pillow supports it. Variant files are named after
+a hash of the original's bytes, so events sharing an image share its variants
+and an unchanged image is never encoded twice. ``Event.image_variants``
+records what was generated::
+
+    {"source": "event_images/jazz.png",
+     "webp": {"320": "event_images/variants/3f2a...-320.webp", ...},
+     "avif": {...}}
+
+Encoding takes too long for a request, so variants are built by the
+``generate_image_variants`` command, run as a background job; saving an event
+with a new image only drops its old variants (see signals).
+"""
+import hashlib
+import io
+import logging
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import ExifTags, Image, ImageOps, features
+
+logger = logging.getLogger(__name__)
+
+VARIANT_DIR = 'event_images/variants'
+VARIANT_WIDTHS = (320, 640, 1280)
+
+FORMATS = {
+    'webp': {'format': 'WEBP', 'quality': 80, 'method': 4},
+}
+if features.check('avif'):
+    FORMATS['avif'] = {'format': 'AVIF', 'quality': 55}
+
+
+def content_hash(file):
+    digest = hashlib.sha256()
+    file.open('rb')
+    try:
+        for chunk in file.chunks():
+            digest.update(chunk)
+    finally:
+        file.close()
+    return digest.hexdigest()[:16]
+
+
+def _source_width(file):
+    # Only the header is read here
+    file.open('rb')
+    try:
+        image = Image.open(file)
+        width, height = image.size
+        # EXIF orientations 5-8 are turned a quarter, swapping the axes
+        if image.getexif().get(ExifTags.Base.Orientation, 1) > 4:
+            width = height
+    finally:
+        file.close()
+    return width
+
+
+def _load(file):
+    file.open('rb')
+    try:
+        image = ImageOps.exif_transpose(Image.open(file))
+        image.load()
+    finally:
+        file.close()
+    if image.mode not in ('RGB', 'RGBA'):
+        has_alpha = image.mode in ('LA', 'PA') or 'transparency' in image.info
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+    return image
+
+
+def _widths(original_width):
+    # Never upscale; an image narrower than every size gets one variant at its own width
+    widths = [width for width in VARIANT_WIDTHS if width < original_width]
+    return widths or [original_width]
+
+
+def generate_variants(file, storage=default_storage):
+    """Encode ``file`` at every variant width and format and return the mapping"""
+    digest = content_hash(file)
+    widths = _widths(_source_width(file))
+    variants = {'source': file.name}
+    image = None
+    for name, options in FORMATS.items():
+        variants[name] = {}
+        for width in widths:
+            path = f'{VARIANT_DIR}/{digest}-{width}.{name}'
+            if not storage.exists(path):
+                # Decode the original only when something is actually missing
+                if image is None:
+                    image = _load(file)
+                height = max(1, round(image.height * width / image.width))
+                buffer = io.BytesIO()
+                image.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=3.0).save(buffer, **options)
+                path = storage.save(path, ContentFile(buffer.getvalue()))
+            variants[name][str(width)] = path
+    return variants
+
+
+def variants_for(event):
+    """Return ``event``'s variants, generating them if the image changed.
+
+    Unreadable images are logged and get no variants, so clients fall back to
+    the original.
+    """
+    if not event.image:
+        return {}
+    if event.image_variants.get('source') == event.image.name:
+        return event.image_variants
+    try:
+        return generate_variants(event.image)
+    except FileNotFoundError:
+        logger.warning('Image %s of event %s is missing from storage', event.image.name, event.pk)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        logger.exception('Could not generate variants for event %s image %s', event.pk, event.image.name)
+    return {'source': event.image.name}
+
+
+def srcsets(variants, build_url=None):
+    """Map each format to an HTML ``srcset`` string, e.g. ``{'webp': 'a.webp 320w, b.webp 640w'}``"""
+    build_url = build_url or default_storage.url
+    result = {}
+    for name in FORMATS:
+        sizes = sorted((int(width), path) for width, path in variants.get(name, {}).items())
+        if sizes:
+            result[name] = ', '.join(f'{build_url(path)} {width}w' for width, path in sizes)
+    return result
@@ -0,0 +1,175 @@
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, reset_queries
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from events import synthetic
+from events.caching import response_cache
+from events.hotset import upcoming_events
+from events.models import Category, Event, EventRegistration
+from events.tracking import view_counter
+from users.models import CustomUser
+
+ENDPOINTS = ['list', 'nearby', 'trending', 'registered_events', 'register']
+# Cached responses are dropped before every sample so these measure the view itself
+COLD_ENDPOINTS = {'registered_events': ('event_details',)}
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the events API at several data sizes and write the results as JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', default='100,1000,10000',
+            help='Comma-separated event counts to benchmark at',
+        )
+        parser.add_argument('--iterations', type=int, default=30, help='Timed requests per endpoint')
+        parser.add_argument('--endpoints', default=','.join(ENDPOINTS))
+        parser.add_argument('--output', help='Write JSON results here instead of stdout')
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',')]
+        endpoints = options['endpoints'].split(',')
+        unknown = set(endpoints) - set(ENDPOINTS)
+        if unknown:
+            raise CommandError(f'Unknown endpoints: {", ".join(sorted(unknown))}')
+
+        # Everything runs against a throwaway test database and in-process
+        # caches, so the real view counters and shared Redis are left alone
+        throwaway_caches = {
+            alias: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': f'benchmark-{alias}'}
+            for alias in settings.CACHES
+        }
+        with override_settings(CACHES=throwaway_caches):
+            old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+            try:
+                runs = []
+                for size in sizes:
+                    self.stderr.write(f'Seeding {size} events...')
+                    context = self.seed(size)
+                    for endpoint in endpoints:
+                        result = self.measure(endpoint, context, options['iterations'])
+                        result['events'] = size
+                        runs.append(result)
+                        self.stderr.write(
+                            f'  {endpoint:<18} p50={result["p50_ms"]:.2f}ms p99={result["p99_ms"]:.2f}ms '
+                            f'queries={result["queries"]} peak={result["peak_kb"]:.0f}KB'
+                        )
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        report = json.dumps({
+            'generated_at': timezone.now().isoformat(),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'database': connection.vendor,
+            'iterations': options['iterations'],
+            'results': runs,
+        }, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(report + '\n')
+            self.stdout.write(self.style.SUCCESS(f'✅ Wrote {len(runs)} result(s) to {options["output"]}'))
+        else:
+            self.stdout.write(report)
+
+    def seed(self, size):
+        """Reset the database to ``size`` events plus proportional users and registrations"""
+        EventRegistration.objects.all().delete()
+        Event.objects.all().delete()
+        CustomUser.objects.all().delete()
+        Category.objects.all().delete()
+        # Only ever the throwaway caches set up in handle()
+        for cache in caches.all():
+            cache.clear()
+        view_counter._dirty.clear()
+
+        categories = Category.objects.bulk_create(
+            Category(name=name, slug=name.lower()) for name in ['Music', 'Sports', 'Technology', 'Food', 'Arts']
+        )
+        user_count = max(10, size // 10)
+        synthetic.bulk_insert(CustomUser, synthetic.generate_users(user_count))
+        user_ids = list(CustomUser.objects.order_by('id').values_list('id', flat=True))
+        synthetic.bulk_insert(Event, synthetic.generate_events(size, user_ids, [c.id for c in categories]))
+        event_ids = list(Event.objects.order_by('id').values_list('id', flat=True))
+
+        pairs = list(synthetic.registration_pairs(size * 2, user_ids, event_ids))
+        synthetic.bulk_insert(EventRegistration, synthetic.generate_registrations(pairs))
+        synthetic.bulk_insert(Event.attendees.through, synthetic.generate_attendance(pairs))
+        synthetic.finalize()
+        # Bulk inserts send no signals
+        upcoming_events.reconcile()
+
+        # The benchmark user attends many events; register targets ones they have not
+        user = CustomUser.objects.get(id=user_ids[0])
+        attending = set(EventRegistration.objects.filter(user=user).values_list('event_id', flat=True))
+        return {
+            'token': str(AccessToken.for_user(user)),
+            'register_targets': iter([event_id for event_id in event_ids if event_id not in attending]),
+        }
+
+    def request(self, endpoint, context):
+        client = Client(HTTP_HOST='localhost', HTTP_AUTHORIZATION=f'Bearer {context["token"]}')
+        if endpoint == 'list':
+            return lambda: client.get('/api/events/')
+        if endpoint == 'nearby':
+            return lambda: client.get('/api/events/nearby/', {'lat': -1.2921, 'lon': 36.8219, 'radius': 10})
+        if endpoint == 'trending':
+            return lambda: client.get('/api/events/trending/', {'limit': 10})
+        if endpoint == 'registered_events':
+            return lambda: client.get('/api/events/registered_events/')
+
+        def register():
+            event_id = next(context['register_targets'])
+            return client.post(
+                f'/api/events/{event_id}/register/',
+                {'attendee_name': 'Bench Mark', 'attendee_email': 'bench@synthetic.local'},
+                content_type='application/json',
+            )
+        return register
+
+    def measure(self, endpoint, context, iterations):
+        send = self.request(endpoint, context)
+        cold_scopes = COLD_ENDPOINTS.get(endpoint, ())
+        response = send()  # warm up
+        if response.status_code >= 400:
+            raise CommandError(f'{endpoint} returned {response.status_code}: {response.content[:200]!r}')
+
+        # The query log is a bounded deque; empty it so the count cannot saturate
+        reset_queries()
+        response_cache.invalidate(*cold_scopes)
+        with CaptureQueriesContext(connection) as queries:
+            send()
+
+        response_cache.invalidate(*cold_scopes)
+        tracemalloc.start()
+        send()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        latencies = []
+        for _ in range(iterations):
+            response_cache.invalidate(*cold_scopes)
+            started = time.perf_counter()
+            send()
+            latencies.append((time.perf_counter() - started) * 1000)
+        latencies.sort()
+        return {
+            'endpoint': endpoint,
+            'p50_ms': round(statistics.median(latencies), 3),
+            'p99_ms': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))], 3),
+            'mean_ms': round(statistics.fmean(latencies), 3),
+            'queries': len(queries),
+            'peak_kb': round(peak / 1024, 1),
+        }
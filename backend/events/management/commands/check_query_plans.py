@@ -0,0 +1,107 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.tokens import AccessToken
+
+from events.caching import response_cache, user_scope
+from events.models import EventRegistration
+from events.trending import leaderboard
+
+# Small lookup tables that are fine to read in full
+SCANNABLE_TABLES = {'events_category'}
+
+
+class Command(BaseCommand):
+    help = "Check that every events endpoint's queries are answered from indexes, not table scans"
+
+    def handle(self, *args, **options):
+        registration = EventRegistration.objects.select_related('user', 'event__created_by').first()
+        if registration is None:
+            raise CommandError('Needs at least one registration; run seed_events first')
+        event = registration.event
+        user = registration.user
+
+        endpoints = {
+            'list': '/api/events/',
+            'list by category': f'/api/events/?category={event.category.slug if event.category else ""}',
+            'list by creator': f'/api/events/?created_by={event.created_by_id}',
+            'search': '/api/events/?search=festival',
+            'retrieve': f'/api/events/{event.pk}/',
+            'nearby': f'/api/events/nearby/?lat={event.latitude}&lon={event.longitude}&radius=10',
+            'nearby by date': f'/api/events/nearby/?lat={event.latitude}&lon={event.longitude}&ordering=date',
+            'trending': '/api/events/trending/',
+            'registered_events': '/api/events/registered_events/',
+            'registered upcoming': '/api/events/registered_events/?when=upcoming',
+            'registered past': '/api/events/registered_events/?when=past',
+            'registrations': (f'/api/events/{event.pk}/registrations/', event.created_by),
+            'categories': '/api/categories/',
+        }
+
+        failures = 0
+        for name, target in endpoints.items():
+            url, as_user = target if isinstance(target, tuple) else (target, user)
+            client = Client(HTTP_HOST='localhost', HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(as_user)}')
+            if name == 'trending':
+                # Include the leaderboard rebuild that refresh_trending runs
+                leaderboard.cache.delete(leaderboard.cache_key)
+            # Per-user responses are cached; drop them so the queries run
+            response_cache.invalidate(user_scope(as_user.pk))
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(url)
+            if response.status_code != 200:
+                raise CommandError(f'{name}: {url} returned {response.status_code}')
+
+            scans = []
+            for query in queries.captured_queries:
+                if not query['sql'].lstrip().upper().startswith('SELECT'):
+                    continue
+                plan = self.explain(query['sql'])
+                scans.extend((query['sql'], table) for table in self.full_scans(plan))
+                if options['verbosity'] > 1:
+                    self.stdout.write(f'  {query["sql"][:120]}\n    {plan}')
+
+            if scans:
+                failures += 1
+                self.stdout.write(self.style.ERROR(f'✗ {name}'))
+                for sql, table in scans:
+                    self.stdout.write(f'    full scan of {table}: {sql[:200]}')
+            else:
+                self.stdout.write(self.style.SUCCESS(f'✓ {name}'))
+
+        if failures:
+            raise CommandError(f'{failures} endpoint(s) scan tables without an index')
+        self.stdout.write(self.style.SUCCESS(f'\n✅ All {len(endpoints)} endpoints use indexes'))
+
+    def explain(self, sql):
+        with transaction.atomic(), connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                # Tiny tables make a seq scan cheapest; ask whether an index could serve instead
+                cursor.execute('SET LOCAL enable_seqscan = off')
+                cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}')
+                plan = cursor.fetchone()[0]
+                return plan if isinstance(plan, list) else json.loads(plan)
+            if connection.vendor == 'sqlite':
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                return [row[-1] for row in cursor.fetchall()]
+        raise CommandError(f'Query plans are not supported on {connection.vendor}')
+
+    def full_scans(self, plan):
+        """Yield the tables ``plan`` reads without an index"""
+        if connection.vendor == 'sqlite':
+            for step in plan:
+                # "SCAN t USING INDEX ..." walks an index; a bare "SCAN t" reads the table
+                if step.startswith('SCAN ') and ' USING ' not in step and 'VIRTUAL TABLE' not in step:
+                    table = step.split()[1]
+                    if table not in SCANNABLE_TABLES:
+                        yield table
+            return
+
+        nodes = [node['Plan'] for node in plan]
+        while nodes:
+            node = nodes.pop()
+            nodes.extend(node.get('Plans', []))
+            if node['Node Type'] == 'Seq Scan' and node['Relation Name'] not in SCANNABLE_TABLES:
+                yield node['Relation Name']
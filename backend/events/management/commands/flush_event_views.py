@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from events.models import Event
+from events.tracking import view_counter
+
+
+class Command(BaseCommand):
+    help = 'Flush buffered event view counts from the cache into Event.views'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=view_counter.batch_size)
+
+    def handle(self, *args, **options):
+        view_counter.batch_size = options['batch_size']
+        # Counters may have been recorded by any worker, so check every event
+        event_ids = Event.objects.values_list('id', flat=True).iterator(chunk_size=options['batch_size'])
+        flushed = view_counter.flush(event_ids)
+        self.stdout.write(self.style.SUCCESS(f'✅ Flushed {flushed} view(s)'))
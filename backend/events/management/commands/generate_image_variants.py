@@ -0,0 +1,63 @@
+import time
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db.models import F, Q
+from django.db.models.fields.json import KT
+from events import images
+from events.caching import response_cache
+from events.models import Event
+from events.synthetic import batched
+
+
+class Command(BaseCommand):
+    help = 'Generate resized WebP/AVIF variants for event images that lack them'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--force', action='store_true', help='Rebuild variants even if they look current')
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help='Keep running and look for new images every N seconds (0 processes once)',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            self.process(options)
+            if not options['interval']:
+                break
+            # Later passes only pick up images changed since
+            options['force'] = False
+            time.sleep(options['interval'])
+
+    def process(self, options):
+        # Many events share an image, so group them and encode each image once
+        pending = defaultdict(list)
+        rows = Event.objects.exclude(image='').exclude(image__isnull=True)
+        if not options['force']:
+            rows = rows.annotate(source=KT('image_variants__source')).filter(
+                Q(source__isnull=True) | ~Q(source=F('image'))
+            )
+        rows = rows.order_by('id').values_list('id', 'image')
+        for event_id, image in rows.iterator(chunk_size=options['batch_size']):
+            pending[image].append(event_id)
+
+        updated = failed = 0
+        for image, event_ids in pending.items():
+            variants = images.variants_for(Event(pk=event_ids[0], image=image))
+            if not any(name in variants for name in images.FORMATS):
+                failed += 1
+                self.stdout.write(self.style.WARNING(f'⚠ Could not process {image}'))
+            for batch in batched(event_ids, options['batch_size']):
+                # Unless the event got another image meanwhile
+                Event.objects.filter(pk__in=batch, image=image).update(image_variants=variants)
+            updated += len(event_ids)
+            if options['verbosity'] > 1:
+                self.stdout.write(f'{image}: {len(event_ids)} event(s)')
+
+        if pending:
+            response_cache.invalidate('events', 'event_details')
+        if pending or not options['interval']:
+            self.stdout.write(
+                self.style.SUCCESS(f'✅ Processed {len(pending) - failed} image(s) for {updated} event(s)')
+            )
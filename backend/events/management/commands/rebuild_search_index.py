@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.db import connections
+from events import search
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index for all events'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        using = options['database']
+        if search.get_backend(connections[using]) is None:
+            self.stdout.write(self.style.WARNING(
+                f'No full-text backend for {connections[using].vendor}; search falls back to icontains'
+            ))
+            return
+        search.rebuild_index(using=using)
+        self.stdout.write(self.style.SUCCESS('✅ Search index rebuilt'))
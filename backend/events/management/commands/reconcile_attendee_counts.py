@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from events.caching import response_cache
+from events.models import Event
+
+
+class Command(BaseCommand):
+    help = 'Repair Event.attendee_count from the attendees table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true', help='Report drift without writing')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        attendance = Event.attendees.through.objects.filter(event_id=OuterRef('pk')).order_by().values(
+            'event_id'
+        ).annotate(total=Count('*')).values('total')
+
+        # Only rows whose stored counter disagrees with the real count are touched
+        drifted = Event.objects.annotate(actual=Coalesce(Subquery(attendance), 0)).exclude(
+            attendee_count=F('actual')
+        ).values_list('id', 'attendee_count', 'actual')
+
+        fixed = 0
+        batch = []
+        for event_id, stored, actual in drifted.iterator(chunk_size=batch_size):
+            self.stdout.write(f'Event {event_id}: attendee_count {stored} -> {actual}')
+            batch.append(Event(id=event_id, attendee_count=actual))
+            if len(batch) >= batch_size:
+                fixed += self._write(batch, options['dry_run'])
+                batch = []
+        if batch:
+            fixed += self._write(batch, options['dry_run'])
+
+        verb = 'Would repair' if options['dry_run'] else 'Repaired'
+        self.stdout.write(self.style.SUCCESS(f'\n✅ {verb} {fixed} event(s)'))
+
+    def _write(self, batch, dry_run):
+        if not dry_run:
+            Event.objects.bulk_update(batch, ['attendee_count'])
+            response_cache.invalidate('events', 'event_details')
+        return len(batch)
@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+from events.trending import ALL, leaderboard
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the trending events leaderboard'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help='Keep running and rebuild every N seconds (0 rebuilds once)',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            boards = leaderboard.rebuild()
+            self.stdout.write(self.style.SUCCESS(
+                f'✅ Ranked {len(boards.get(ALL, []))} event(s) across {len(boards) - 1 if boards else 0} categories'
+            ))
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
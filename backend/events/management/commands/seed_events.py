@@ -1,14 +1,64 @@
-from django.core.management.base import BaseCommand
+import multiprocessing
+import time
+from array import array
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
 from django.utils import timezone
 from datetime import timedelta
-from events.models import Event, Category, Ticket
+from events import synthetic
+from events.models import Event, Category, EventRegistration, Ticket
 from users.models import CustomUser
 
+# Shared with forked workers by inheritance rather than pickling
+_worker_state = {}
+
+
+def _insert_range(task):
+    """Insert one slice of synthetic rows; runs inside a worker process"""
+    kind, start, count, batch_size = task
+    state = _worker_state
+    if kind == 'users':
+        written = synthetic.bulk_insert(CustomUser, synthetic.generate_users(count, start), batch_size)
+    elif kind == 'events':
+        rows = synthetic.generate_events(
+            count, state['creator_ids'], state['category_ids'], start, seed=state['seed']
+        )
+        written = synthetic.bulk_insert(Event, rows, batch_size)
+    else:
+        def pairs():
+            return synthetic.registration_pairs(count, state['user_ids'], state['event_ids'], start)
+        # Reruns may overlap existing pairs; the unique constraints skip them
+        written = synthetic.bulk_insert(
+            EventRegistration, synthetic.generate_registrations(pairs()), batch_size, ignore_conflicts=True
+        )
+        synthetic.bulk_insert(
+            Event.attendees.through, synthetic.generate_attendance(pairs()), batch_size, ignore_conflicts=True
+        )
+    connections.close_all()
+    return written
+
 
 class Command(BaseCommand):
-    help = 'Seeds the database with sample Nairobi events'
+    help = 'Seeds the database with sample Nairobi events, or bulk synthetic data with --count/--users/--registrations'
 
-    def handle(self, *args, **kwargs):
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=0, help='Generate this many synthetic events')
+        parser.add_argument('--users', type=int, default=0, help='Generate this many synthetic users')
+        parser.add_argument(
+            '--registrations', type=int, default=0,
+            help='Generate this many registrations between synthetic users and events',
+        )
+        parser.add_argument('--batch-size', type=int, default=synthetic.BATCH_SIZE)
+        parser.add_argument('--workers', type=int, default=1, help='Insert in this many processes')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for event generation')
+
+    def handle(self, *args, **options):
+        if options['count'] or options['users'] or options['registrations']:
+            return self.seed_bulk(options)
+        self.seed_samples()
+
+    def seed_samples(self):
         self.stdout.write('Seeding database with Nairobi events...')
 
         # Get or create a default user for events
@@ -26,23 +76,7 @@ class Command(BaseCommand):
             user.save()
             self.stdout.write(self.style.SUCCESS(f'Created user: {user.email}'))
 
-        # Create categories
-        categories_data = [
-            {'name': 'Music', 'slug': 'music'},
-            {'name': 'Sports', 'slug': 'sports'},
-            {'name': 'Technology', 'slug': 'technology'},
-            {'name': 'Food & Drink', 'slug': 'food-drink'},
-            {'name': 'Arts & Culture', 'slug': 'arts-culture'},
-            {'name': 'Business', 'slug': 'business'},
-            {'name': 'Networking', 'slug': 'networking'},
-        ]
-
-        categories = {}
-        for cat_data in categories_data:
-            category, created = Category.objects.get_or_create(**cat_data)
-            categories[cat_data['name']] = category
-            if created:
-                self.stdout.write(self.style.SUCCESS(f'Created category: {category.name}'))
+        categories = self.ensure_categories()
 
         # Sample Nairobi events with images
         events_data = [
@@ -195,3 +229,84 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS('\n✅ Database seeding completed!'))
         self.stdout.write(self.style.SUCCESS(f'Total events: {Event.objects.count()}'))
         self.stdout.write(self.style.SUCCESS(f'Total categories: {Category.objects.count()}'))
+
+    def seed_bulk(self, options):
+        workers = options['workers']
+        if workers > 1 and (connection.vendor == 'sqlite' or 'fork' not in multiprocessing.get_all_start_methods()):
+            # SQLite serializes writers anyway, and workers rely on fork to share state
+            self.stdout.write(self.style.WARNING('Parallel seeding needs PostgreSQL and fork(); using one process'))
+            workers = 1
+        self.workers = workers
+        self.batch_size = options['batch_size']
+        _worker_state['seed'] = options['seed']
+        started = time.monotonic()
+
+        category_ids = [category.id for category in self.ensure_categories().values()]
+        synthetic_users = CustomUser.objects.filter(email__endswith='@synthetic.local')
+
+        if options['users']:
+            # Continue numbering after earlier runs so emails stay unique
+            offset = synthetic_users.count()
+            self.run('users', offset, options['users'])
+
+        if options['count']:
+            # A small pool of hosts creates every event
+            creator_ids = list(synthetic_users.order_by('id').values_list('id', flat=True)[:1000])
+            if not creator_ids:
+                raise CommandError('Synthetic events need synthetic users; pass --users as well')
+            _worker_state.update(creator_ids=creator_ids, category_ids=category_ids)
+            offset = Event.objects.count()
+            self.run('events', offset, options['count'])
+
+        if options['registrations']:
+            # Compact id columns; a few bytes per row even at millions of rows
+            _worker_state['user_ids'] = array('q', synthetic_users.order_by('id').values_list('id', flat=True).iterator())
+            _worker_state['event_ids'] = array('q', Event.objects.order_by('id').values_list('id', flat=True).iterator())
+            if not _worker_state['user_ids'] or not _worker_state['event_ids']:
+                raise CommandError('Registrations need existing synthetic users and events')
+            offset = EventRegistration.objects.filter(user__email__endswith='@synthetic.local').count()
+            self.run('registrations', offset, options['registrations'])
+
+        self.stdout.write('Rebuilding attendee counts, search index and trending...')
+        synthetic.finalize()
+        self.stdout.write(self.style.SUCCESS(f'\n✅ Bulk seeding completed in {time.monotonic() - started:.1f}s'))
+        self.stdout.write(self.style.SUCCESS(f'Total users: {CustomUser.objects.count()}'))
+        self.stdout.write(self.style.SUCCESS(f'Total events: {Event.objects.count()}'))
+        self.stdout.write(self.style.SUCCESS(f'Total registrations: {EventRegistration.objects.count()}'))
+
+    def run(self, kind, offset, count):
+        """Insert ``count`` rows of ``kind`` starting at ``offset``, split across workers"""
+        self.stdout.write(f'Generating {count} {kind}...')
+        chunk = max(self.batch_size, -(-count // (self.workers * 4)))
+        tasks = [
+            (kind, start, min(chunk, offset + count - start), self.batch_size)
+            for start in range(offset, offset + count, chunk)
+        ]
+        if self.workers == 1:
+            written = sum(map(_insert_range, tasks))
+        else:
+            # Children must open their own database connections
+            connections.close_all()
+            with multiprocessing.get_context('fork').Pool(self.workers) as pool:
+                written = sum(pool.imap_unordered(_insert_range, tasks))
+        self.stdout.write(self.style.SUCCESS(f'Created {written} {kind}'))
+
+    def ensure_categories(self):
+        # Create categories
+        categories_data = [
+            {'name': 'Music', 'slug': 'music'},
+            {'name': 'Sports', 'slug': 'sports'},
+            {'name': 'Technology', 'slug': 'technology'},
+            {'name': 'Food & Drink', 'slug': 'food-drink'},
+            {'name': 'Arts & Culture', 'slug': 'arts-culture'},
+            {'name': 'Business', 'slug': 'business'},
+            {'name': 'Networking', 'slug': 'networking'},
+        ]
+
+        categories = {}
+        for cat_data in categories_data:
+            category, created = Category.objects.get_or_create(**cat_data)
+            categories[cat_data['name']] = category
+            if created:
+                self.stdout.write(self.style.SUCCESS(f'Created category: {category.name}'))
+        return categories
@@ -0,0 +1,116 @@
+import time
+import uuid
+from datetime import timedelta
+
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+from events.models import OutboundEmail
+
+
+class Command(BaseCommand):
+    help = 'Deliver pending outbox emails in batches over a single SMTP connection'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50)
+        parser.add_argument('--max-attempts', type=int, default=5)
+        parser.add_argument('--backoff', type=int, default=60, help='Base retry delay in seconds, doubled per attempt')
+        parser.add_argument(
+            '--claim-timeout', type=int, default=600,
+            help='Seconds after which emails claimed by a worker that stopped are sent again',
+        )
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help='Keep running and poll every N seconds when the outbox is empty (0 drains once)',
+        )
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+        while True:
+            sent, failed = self.drain_batch(options)
+            total_sent += sent
+            total_failed += failed
+            if sent or failed:
+                continue
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(f'✅ Sent {total_sent} email(s), {total_failed} failed'))
+
+    def drain_batch(self, options):
+        """Send one batch of due emails; returns (sent, failed) counts"""
+        batch = self.claim_batch(options)
+        if not batch:
+            return 0, 0
+
+        # Sent outside any transaction, so no locks are held while SMTP is slow
+        sent = 0
+        mail_connection = get_connection()
+        try:
+            try:
+                mail_connection.open()
+            except Exception as e:
+                # Could not reach the mail server at all; retry the whole batch later
+                for email in batch:
+                    email.attempts += 1
+                    self.retry_later(email, e, options)
+            else:
+                for email in batch:
+                    email.attempts += 1
+                    try:
+                        EmailMessage(
+                            subject=email.subject,
+                            body=email.body,
+                            from_email=email.from_email,
+                            to=[email.to_email],
+                            connection=mail_connection,
+                        ).send()
+                    except Exception as e:
+                        self.retry_later(email, e, options)
+                    else:
+                        email.status = OutboundEmail.SENT
+                        email.sent_at = timezone.now()
+                        email.last_error = ''
+                        sent += 1
+        finally:
+            mail_connection.close()
+            OutboundEmail.objects.bulk_update(
+                batch, ['status', 'attempts', 'last_error', 'next_attempt_at', 'sent_at']
+            )
+        failed = sum(email.status == OutboundEmail.FAILED for email in batch)
+        return sent, failed
+
+    def claim_batch(self, options):
+        """Mark a batch of due emails as being sent by this worker and return them"""
+        now = timezone.now()
+        # Claims left by a worker that died mid-batch are sent again
+        OutboundEmail.objects.filter(
+            status=OutboundEmail.SENDING, claimed_at__lt=now - timedelta(seconds=options['claim_timeout'])
+        ).update(status=OutboundEmail.PENDING)
+
+        due = OutboundEmail.objects.filter(status=OutboundEmail.PENDING, next_attempt_at__lte=now)
+        owner = uuid.uuid4().hex
+        with transaction.atomic():
+            pending = due.order_by('next_attempt_at', 'id').values_list('id', flat=True)
+            if connection.features.has_select_for_update_skip_locked:
+                # Lets several workers claim batches at once
+                pending = pending.select_for_update(skip_locked=True)
+            # Rows another worker claimed meanwhile no longer match, as the
+            # update re-checks the status
+            due.filter(pk__in=list(pending[:options['batch_size']])).update(
+                status=OutboundEmail.SENDING, claimed_by=owner, claimed_at=now
+            )
+        claimed = OutboundEmail.objects.filter(status=OutboundEmail.SENDING, claimed_by=owner)
+        return list(claimed.order_by('next_attempt_at', 'id'))
+
+    def retry_later(self, email, error, options):
+        email.last_error = str(error)
+        if email.attempts >= options['max_attempts']:
+            email.status = OutboundEmail.FAILED
+            self.stderr.write(f'Giving up on email {email.id} to {email.to_email}: {error}')
+        else:
+            email.status = OutboundEmail.PENDING
+            delay = options['backoff'] * 2 ** (email.attempts - 1)
+            email.next_attempt_at = timezone.now() + timedelta(seconds=delay)
@@ -0,0 +1,43 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = 'Copy the SQLite primary into the SQLite read replicas, for trying replica routing locally'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float, default=0,
+            help='Keep copying every N seconds, like a lagging replica (default: copy once)'
+        )
+
+    def handle(self, *args, **options):
+        replicas = getattr(settings, 'REPLICA_DATABASES', ())
+        if not replicas:
+            raise CommandError('No replicas configured; set DATABASE_REPLICA_URLS')
+        for alias in ('default', *replicas):
+            if connections[alias].vendor != 'sqlite':
+                raise CommandError(f'{alias} is not SQLite; use the database\'s own replication')
+
+        primary = connections['default'].settings_dict['NAME']
+        while True:
+            for alias in replicas:
+                self.copy(primary, connections[alias].settings_dict['NAME'])
+            self.stdout.write(self.style.SUCCESS(f'✅ Copied {primary} to {len(replicas)} replica(s)'))
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
+
+    def copy(self, source_name, target_name):
+        # The backup API takes a consistent snapshot while other processes write
+        source = sqlite3.connect(source_name)
+        target = sqlite3.connect(target_name)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
@@ -1,68 +1,111 @@
+import multiprocessing
+import re
+from collections import defaultdict
+
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from events.caching import response_cache
 from events.models import Event
-import os
+from events.synthetic import batched
+
+# Mapping of event title keywords to image filenames; earlier keywords win
+IMAGE_MAPPING = {
+    'art': 'event_images/art_exhibition.png',
+    'exhibition': 'event_images/art_exhibition.png',
+    'business': 'event_images/business.jpg',
+    'comedy': 'event_images/comedy_night.jpg',
+    'farmers': 'event_images/farmers_night.jpg',
+    'farm': 'event_images/farmers_night.jpg',
+    'food': 'event_images/food_festival.png',
+    'festival': 'event_images/food_festival.png',
+    'forest': 'event_images/forest_walk.png',
+    'walk': 'event_images/forest_walk.png',
+    'hiking': 'event_images/forest_walk.png',
+    'jazz': 'event_images/jazz_festival.png',
+    'music': 'event_images/jazz_festival.png',
+    'marathon': 'event_images/marathon.png',
+    'run': 'event_images/marathon.png',
+    'race': 'event_images/marathon.png',
+    'networking': 'event_images/networking_mixer.png',
+    'mixer': 'event_images/networking_mixer.png',
+    'tech': 'event_images/tech_summit.png',
+    'summit': 'event_images/tech_summit.png',
+    'technology': 'event_images/tech_summit.png',
+}
+
+KEYWORD_PRIORITY = {keyword: priority for priority, keyword in enumerate(IMAGE_MAPPING)}
+
+# One pass over the title finds every keyword occurrence: the lookahead matches
+# at each position (so overlapping keywords are all seen) and the alternation
+# is in priority order (so the best keyword starting there is captured)
+KEYWORD_RE = re.compile('(?=(' + '|'.join(re.escape(keyword) for keyword in IMAGE_MAPPING) + '))')
+
+
+def match_image(title):
+    """Return the image for the highest-priority keyword contained in ``title``"""
+    found = KEYWORD_RE.findall(title.lower())
+    if not found:
+        return None
+    return IMAGE_MAPPING[min(found, key=KEYWORD_PRIORITY.__getitem__)]
+
+
+def match_batch(rows):
+    return [(event_id, title, match_image(title)) for event_id, title in rows]
 
 
 class Command(BaseCommand):
     help = 'Update event images based on event titles'
 
-    def handle(self, *args, **kwargs):
-        # Mapping of event title keywords to image filenames
-        image_mapping = {
-            'art': 'event_images/art_exhibition.png',
-            'exhibition': 'event_images/art_exhibition.png',
-            'business': 'event_images/business.jpg',
-            'comedy': 'event_images/comedy_night.jpg',
-            'farmers': 'event_images/farmers_night.jpg',
-            'farm': 'event_images/farmers_night.jpg',
-            'food': 'event_images/food_festival.png',
-            'festival': 'event_images/food_festival.png',
-            'forest': 'event_images/forest_walk.png',
-            'walk': 'event_images/forest_walk.png',
-            'hiking': 'event_images/forest_walk.png',
-            'jazz': 'event_images/jazz_festival.png',
-            'music': 'event_images/jazz_festival.png',
-            'marathon': 'event_images/marathon.png',
-            'run': 'event_images/marathon.png',
-            'race': 'event_images/marathon.png',
-            'networking': 'event_images/networking_mixer.png',
-            'mixer': 'event_images/networking_mixer.png',
-            'tech': 'event_images/tech_summit.png',
-            'summit': 'event_images/tech_summit.png',
-            'technology': 'event_images/tech_summit.png',
-        }
-
-        events = Event.objects.all()
-        updated_count = 0
-        
-        for event in events:
-            # Check if event already has an image
-            if event.image:
-                self.stdout.write(
-                    self.style.WARNING(f'Event "{event.title}" already has an image: {event.image}')
-                )
-                continue
-            
-            # Try to match event title to an image
-            title_lower = event.title.lower()
-            matched = False
-            
-            for keyword, image_path in image_mapping.items():
-                if keyword in title_lower:
-                    event.image = image_path
-                    event.save()
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--dry-run', action='store_true', help='Report matches without saving them')
+        parser.add_argument('--workers', type=int, default=1, help='Match titles in this many processes')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        verbose = options['verbosity'] > 1
+
+        # Events that already have an image are skipped by the database
+        missing = Event.objects.filter(Q(image__isnull=True) | Q(image='')).order_by('id')
+        rows = batched(missing.values_list('id', 'title').iterator(chunk_size=batch_size), batch_size)
+
+        pool = None
+        if options['workers'] > 1:
+            pool = multiprocessing.Pool(options['workers'])
+            results = pool.imap(match_batch, rows)
+        else:
+            results = map(match_batch, rows)
+
+        updated_count = unmatched_count = 0
+        try:
+            for matches in results:
+                # Only a handful of distinct images exist, so one UPDATE per image
+                # beats a per-row CASE
+                changed = defaultdict(list)
+                for event_id, title, image_path in matches:
+                    if image_path is None:
+                        unmatched_count += 1
+                        if verbose:
+                            self.stdout.write(self.style.WARNING(f'⚠ No matching image found for "{title}"'))
+                        continue
+                    changed[image_path].append(event_id)
                     updated_count += 1
-                    matched = True
-                    self.stdout.write(
-                        self.style.SUCCESS(f'✓ Updated "{event.title}" with {image_path}')
-                    )
-                    break
-            
-            if not matched:
-                self.stdout.write(
-                    self.style.WARNING(f'⚠ No matching image found for "{event.title}"')
-                )
-        
+                    if verbose:
+                        self.stdout.write(self.style.SUCCESS(f'✓ Updated "{title}" with {image_path}'))
+                if options['dry_run']:
+                    continue
+                with transaction.atomic():
+                    for image_path, event_ids in changed.items():
+                        Event.objects.filter(pk__in=event_ids).update(image=image_path)
+                    response_cache.invalidate('events', 'event_details')
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+        verb = 'Would update' if options['dry_run'] else 'Successfully updated'
+        self.stdout.write(self.style.WARNING(f'⚠ {unmatched_count} event(s) had no matching keyword'))
         self.stdout.write(
-            self.style.SUCCESS(f'\n✅ Successfully updated {updated_count} event(s)')
+            self.style.SUCCESS(f'\n✅ {verb} {updated_count} event(s)')
         )
@@ -0,0 +1,281 @@
+"""Per-request instrumentation.
+
+``MetricsMiddleware`` measures every request: total latency, the number of
+database queries and the time spent in them (via an ``execute_wrapper`` on
+every connection, so it works with ``DEBUG`` off and in async views) and the
+time spent turning models into response data (``TimedSerializerMixin``).
+Measurements are tagged with the view that served the request,
+``EventViewSet.trending`` rather than a URL, and kept as Prometheus
+histograms that ``metrics_view`` exposes in the text format.
+
+With ``METRICS_LOG_REQUESTS`` on, every request is also logged as one JSON
+line to the ``events.requests`` logger. Requests slower than
+``SLOW_REQUEST_MS`` are logged with the SQL they ran, for a
+``SLOW_REQUEST_SAMPLE_RATE`` fraction of them.
+
+Histograms live in process memory, so each worker reports its own; scrape
+every worker, as Prometheus does for multi-process servers.
+"""
+import bisect
+import contextvars
+import json
+import logging
+import random
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+logger = logging.getLogger('events.requests')
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+# Any other method is labelled "other" so clients cannot add series
+METHODS = {'GET', 'HEAD', 'OPTIONS', 'POST', 'PUT', 'PATCH', 'DELETE'}
+
+# Slow requests keep at most this many statements
+MAX_SAMPLED_QUERIES = 200
+
+_current = contextvars.ContextVar('request_sample', default=None)
+
+
+class Histogram:
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.series = {}
+
+    def observe(self, labels, value):
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self):
+        yield f'# HELP {self.name} {self.help_text}'
+        yield f'# TYPE {self.name} histogram'
+        for labels, (counts, total, count) in sorted(self.series.items()):
+            label_text = _labels(labels)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                yield f'{self.name}_bucket{{{label_text},le="{bound}"}} {cumulative}'
+            yield f'{self.name}_bucket{{{label_text},le="+Inf"}} {count}'
+            yield f'{self.name}_sum{{{label_text}}} {total}'
+            yield f'{self.name}_count{{{label_text}}} {count}'
+
+
+class Counter:
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self.series = {}
+
+    def inc(self, labels):
+        self.series[labels] = self.series.get(labels, 0) + 1
+
+    def render(self):
+        yield f'# HELP {self.name} {self.help_text}'
+        yield f'# TYPE {self.name} counter'
+        for labels, count in sorted(self.series.items()):
+            yield f'{self.name}{{{_labels(labels)}}} {count}'
+
+
+def _labels(labels):
+    return ','.join(f'{key}="{value}"' for key, value in labels)
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = Counter('http_requests_total', 'Requests by view, method and status.')
+        self.latency = Histogram(
+            'http_request_duration_seconds', 'Total request latency.', LATENCY_BUCKETS
+        )
+        self.queries = Histogram('db_queries_per_request', 'Database queries per request.', QUERY_BUCKETS)
+        self.db_time = Histogram(
+            'db_query_duration_seconds', 'Time per request spent in database queries.', LATENCY_BUCKETS
+        )
+        self.serializer_time = Histogram(
+            'serializer_duration_seconds', 'Time per request spent serializing response data.', LATENCY_BUCKETS
+        )
+
+    def record(self, sample):
+        labels = (('view', sample.view), ('method', sample.method))
+        with self._lock:
+            self.requests.inc((*labels, ('status', str(sample.status))))
+            self.latency.observe(labels, sample.duration)
+            self.queries.observe(labels, sample.query_count)
+            self.db_time.observe(labels, sample.db_time)
+            self.serializer_time.observe(labels, sample.serializer_time)
+
+    def render(self):
+        with self._lock:
+            lines = [
+                line
+                for metric in (self.requests, self.latency, self.queries, self.db_time, self.serializer_time)
+                for line in metric.render()
+            ]
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+
+class RequestSample:
+    def __init__(self, method, path):
+        self.method = method
+        self.path = path
+        self.view = 'unresolved'
+        self.status = 0
+        self.duration = 0.0
+        self.query_count = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializing = False
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        # Called by _record_query around every query of the request
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.query_count += 1
+            self.db_time += elapsed
+            if len(self.statements) < MAX_SAMPLED_QUERIES:
+                self.statements.append((sql, elapsed))
+
+    def as_dict(self):
+        return {
+            'method': self.method,
+            'path': self.path,
+            'view': self.view,
+            'status': self.status,
+            'duration_ms': round(self.duration * 1000, 2),
+            'queries': self.query_count,
+            'db_ms': round(self.db_time * 1000, 2),
+            'serializer_ms': round(self.serializer_time * 1000, 2),
+        }
+
+
+def view_name(view_func, method):
+    """Name a view for metric labels, e.g. ``EventViewSet.trending``"""
+    cls = getattr(view_func, 'cls', None)
+    if cls is None:
+        return f'{view_func.__module__}.{view_func.__name__}'
+    # One viewset route serves several actions; label by the one this method runs
+    action = (getattr(view_func, 'actions', None) or {}).get(method.lower())
+    return f'{cls.__name__}.{action or method.lower()}'
+
+
+def _record_query(execute, sql, params, many, context):
+    sample = _current.get()
+    if sample is None:
+        return execute(sql, params, many, context)
+    return sample(execute, sql, params, many, context)
+
+
+@receiver(connection_created)
+def install_query_recorder(sender, connection, **kwargs):
+    # Installed on every connection rather than per request, so queries run
+    # from async views, on the ORM's worker threads, are counted too
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.log_requests = getattr(settings, 'METRICS_LOG_REQUESTS', False)
+        self.slow_seconds = getattr(settings, 'SLOW_REQUEST_MS', 500) / 1000
+        self.slow_sample_rate = getattr(settings, 'SLOW_REQUEST_SAMPLE_RATE', 1.0)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        sample = RequestSample(request.method if request.method in METHODS else 'other', request.path)
+        token = _current.set(sample)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, sample, response, started)
+
+    async def __acall__(self, request):
+        sample = RequestSample(request.method if request.method in METHODS else 'other', request.path)
+        token = _current.set(sample)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, sample, response, started)
+
+    def finish(self, request, sample, response, started):
+        sample.duration = time.perf_counter() - started
+        sample.status = response.status_code
+        if request.resolver_match is not None:
+            sample.view = view_name(request.resolver_match.func, request.method)
+        self.report(sample)
+        return response
+
+    def report(self, sample):
+        registry.record(sample)
+        if self.log_requests:
+            logger.info(json.dumps(sample.as_dict()))
+        if sample.duration >= self.slow_seconds and random.random() < self.slow_sample_rate:
+            logger.warning(json.dumps({
+                **sample.as_dict(),
+                'slow': True,
+                'sql': [{'sql': sql, 'ms': round(elapsed * 1000, 2)} for sql, elapsed in sample.statements],
+            }))
+
+
+class TimedSerializerMixin:
+    """Add the time spent in ``to_representation`` to the current request's sample.
+
+    Only the outermost serializer is timed, so nested and per-item calls are
+    not counted twice.
+    """
+
+    def to_representation(self, instance):
+        sample = _current.get()
+        if sample is None or sample.serializing:
+            return super().to_representation(instance)
+        sample.serializing = True
+        started = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            sample.serializer_time += time.perf_counter() - started
+            sample.serializing = False
+
+
+def metrics_view(request):
+    """Prometheus text exposition of the request metrics"""
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if not token:
+        # Open only in development; production must configure a token
+        if not settings.DEBUG:
+            raise Http404()
+    elif not constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:42
+
+from django.db import migrations, models
+
+from events import geo
+
+
+def populate_geohash(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    batch = []
+    for event in Event.objects.only('id', 'latitude', 'longitude').iterator(chunk_size=2000):
+        event.geohash = geo.encode(event.latitude, event.longitude)
+        batch.append(event)
+        if len(batch) >= 2000:
+            Event.objects.bulk_update(batch, ['geohash'])
+            batch = []
+    if batch:
+        Event.objects.bulk_update(batch, ['geohash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0005_eventregistration'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=9),
+        ),
+        migrations.RunPython(populate_geohash, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:44
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_attendee_count(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    Attendance = Event.attendees.through
+    counts = Attendance.objects.filter(event_id=OuterRef('pk')).order_by().values('event_id').annotate(
+        total=Count('*')
+    ).values('total')
+    Event.objects.update(attendee_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0007_event_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='attendee_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_attendee_count, migrations.RunPython.noop),
+    ]
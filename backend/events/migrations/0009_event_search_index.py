@@ -0,0 +1,29 @@
+from django.db import migrations
+
+from events import search
+
+
+def install_search_index(apps, schema_editor):
+    backend = search.get_backend(schema_editor.connection)
+    if backend:
+        with schema_editor.connection.cursor() as cursor:
+            backend.install(cursor)
+            backend.rebuild(cursor)
+
+
+def uninstall_search_index(apps, schema_editor):
+    backend = search.get_backend(schema_editor.connection)
+    if backend:
+        with schema_editor.connection.cursor() as cursor:
+            backend.uninstall(cursor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0008_event_attendee_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
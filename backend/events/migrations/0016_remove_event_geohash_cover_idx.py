@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:17
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0015_eventregistration_ticket'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='event',
+            name='event_geohash_cover_idx',
+        ),
+    ]
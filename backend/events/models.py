@@ -1,5 +1,8 @@
 from django.db import models
 from django.conf import settings 
+from django.utils import timezone
+
+from . import geo
 
 # Create your models here.
 class Category(models.Model):
@@ -16,17 +19,51 @@ class Event(models.Model):
     location_name = models.CharField(max_length=255)
     latitude = models.FloatField()
     longitude = models.FloatField()
+    geohash = models.CharField(max_length=geo.GEOHASH_PRECISION, editable=False, blank=True)
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, related_name='events')
     date = models.DateTimeField()
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='events')
     attendees = models.ManyToManyField(settings.AUTH_USER_MODEL, related_name='attending_events', blank=True)
     image = models.ImageField(upload_to='event_images/', null=True, blank=True)
+    # Resized WebP/AVIF copies of image, built by events.images
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     views = models.PositiveIntegerField(default=0)
+    # Denormalized len(attendees); kept in step by register/unregister and
+    # repaired by the reconcile_attendee_counts command
+    attendee_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Keyset pagination orderings used by EventViewSet
+            models.Index(fields=['created_at', 'id'], name='event_created_at_id_idx'),
+            models.Index(fields=['date', 'id'], name='event_date_id_idx'),
+            # Category and creator filtered lists, already in keyset order
+            models.Index(fields=['category', 'created_at', 'id'], name='event_category_created_idx'),
+            models.Index(fields=['created_by', 'created_at', 'id'], name='event_creator_created_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
+    # Incremented in place with F() expressions, never through save()
+    COUNTER_FIELDS = ('views', 'attendee_count')
+
+    def save(self, *args, **kwargs):
+        # Keep the spatial index column in sync with the coordinates
+        self.geohash = geo.encode(self.latitude, self.longitude)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None and not self._state.adding and not kwargs.get('force_insert'):
+            # A full save would write back counts read earlier in the request,
+            # undoing increments made since
+            update_fields = kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
+        if update_fields is not None and {'latitude', 'longitude'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'geohash'}
+        super().save(*args, **kwargs)
+
 
 class Ticket(models.Model):
     event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='tickets')
@@ -46,10 +83,62 @@ class EventRegistration(models.Model):
     attendee_email = models.EmailField()
     attendee_phone = models.CharField(max_length=20, blank=True, null=True)
     registered_at = models.DateTimeField(auto_now_add=True)
+    # The tier the seat was taken from; null for events without tickets
+    ticket = models.ForeignKey(
+        Ticket, on_delete=models.SET_NULL, null=True, blank=True, related_name='registrations'
+    )
 
     class Meta:
         unique_together = ['event', 'user']
         ordering = ['-registered_at']
+        indexes = [
+            models.Index(fields=['event', 'registered_at', 'id'], name='registration_event_seek_idx'),
+            # A user's registered events, without touching the table
+            models.Index(fields=['user', 'event'], name='registration_user_event_idx'),
+        ]
 
     def __str__(self):
         return f"{self.attendee_name} - {self.event.title}"
+
+
+class OutboundEmail(models.Model):
+    """Outbox row for an email to be delivered by the send_outbox_emails worker"""
+    PENDING = 'pending'
+    SENDING = 'sending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (SENDING, 'Sending'),
+        (SENT, 'Sent'),
+        (FAILED, 'Failed'),
+    ]
+
+    registration = models.ForeignKey(
+        EventRegistration, on_delete=models.SET_NULL, null=True, blank=True, related_name='emails'
+    )
+    to_email = models.EmailField()
+    from_email = models.EmailField()
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    # The worker batch sending the email, and since when
+    claimed_by = models.CharField(max_length=32, blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # The worker only ever scans pending rows that are due
+            models.Index(
+                fields=['next_attempt_at', 'id'], name='outbox_pending_due_idx',
+                condition=models.Q(status='pending'),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.to_email} ({self.status})"
@@ -0,0 +1,213 @@
+import base64
+import json
+from datetime import date, datetime
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Cursor pagination that seeks on an indexed (column, id) ordering.
+
+    Each cursor stores the ordering values of the row it points at, so every
+    page is a ``WHERE (col, id) < (...) ORDER BY col, id LIMIT n`` index range
+    scan no matter how deep the client has paged. Views pick the ordering
+    through a ``cursor_ordering`` attribute; the last field must be unique.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    page_size = 20
+    max_page_size = 100
+    ordering = ('-created_at', '-id')
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_ordering(self, view):
+        return tuple(getattr(view, 'cursor_ordering', None) or self.ordering)
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def decode_cursor(self, request):
+        """Return ``(position, reverse)`` from the request, or ``(None, False)``"""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            return list(payload['p']), bool(payload.get('r'))
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, position, reverse=False):
+        payload = {'p': [_json_value(value) for value in position]}
+        if reverse:
+            payload['r'] = 1
+        encoded = base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode('ascii'))
+        url = self.base_url
+        return replace_query_param(url, self.cursor_query_param, encoded.decode('ascii'))
+
+    def clean_position(self, model, fields, position):
+        """Convert cursor values to the types of their ordering fields"""
+        if len(position) != len(fields):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            position = [_field(model, name).to_python(value) for (name, _), value in zip(fields, position)]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        # Ordering columns are never null
+        if None in position:
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset, fields, position, reverse = self._page_query(queryset, request, view)
+        return self._page(list(queryset), fields, position, reverse)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """``paginate_queryset`` for async views"""
+        queryset, fields, position, reverse = self._page_query(queryset, request, view)
+        return self._page([row async for row in queryset], fields, position, reverse)
+
+    def _page_query(self, queryset, request, view):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        ordering = self.get_ordering(view)
+        fields = [(name.lstrip('-'), name.startswith('-')) for name in ordering]
+        position, reverse = self.decode_cursor(request)
+        if position is not None:
+            position = self.clean_position(queryset.model, fields, position)
+
+        if reverse:
+            queryset = queryset.order_by(*[name if desc else '-' + name for name, desc in fields])
+        else:
+            queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(_seek(fields, position, reverse))
+        return queryset[:self.page_size + 1], fields, position, reverse
+
+    def _page(self, rows, fields, position, reverse):
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        keys = [tuple(_attr(row, name) for name, _ in fields) for row in rows]
+        return self._finish(rows, keys, position, reverse, has_more)
+
+    def paginate_keys(self, items, request):
+        """Paginate an in-memory list of ``(key, item)`` pairs sorted ascending by key.
+
+        Used where the ordering is computed in Python, e.g. by distance. Keys are
+        tuples of numbers ending in a unique id.
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request)
+
+        if position is None:
+            window = items[:self.page_size + 1]
+        else:
+            # Keys are numbers; anything else did not come from a cursor we issued
+            if not all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in position) or (
+                items and len(position) != len(items[0][0])
+            ):
+                raise NotFound(self.invalid_cursor_message)
+            if reverse:
+                window = [pair for pair in items if list(pair[0]) < position][-(self.page_size + 1):]
+                window.reverse()
+            else:
+                window = [pair for pair in items if list(pair[0]) > position][:self.page_size + 1]
+
+        has_more = len(window) > self.page_size
+        window = window[:self.page_size]
+        if reverse:
+            window.reverse()
+        return self._finish([item for _, item in window], [key for key, _ in window], position, reverse, has_more)
+
+    def _finish(self, rows, keys, position, reverse, has_more):
+        self.next_position = self.previous_position = None
+        if keys:
+            if has_more or reverse:
+                self.next_position = keys[-1]
+            if position is not None and (has_more or not reverse):
+                self.previous_position = keys[0]
+        elif position is not None:
+            # Paged past either end; offer a way back
+            if reverse:
+                self.next_position = position
+            else:
+                self.previous_position = position
+        return rows
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position)
+
+    def get_previous_link(self):
+        if self.previous_position is None:
+            return None
+        return self.encode_cursor(self.previous_position, reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+def _field(model, name):
+    """The model field behind an ordering name, following ``__`` relations"""
+    *relations, last = name.split('__')
+    for relation in relations:
+        model = model._meta.get_field(relation).related_model
+    return model._meta.get_field(last)
+
+
+def _attr(row, name):
+    if isinstance(row, dict):
+        # .values() rows
+        return row[name]
+    value = row
+    for part in name.split('__'):
+        value = getattr(value, part)
+    return value
+
+
+def _json_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _seek(fields, position, reverse):
+    """Build the row-value comparison ``(a, b, ...) > (x, y, ...)`` as a Q object"""
+    condition = Q()
+    equal = Q()
+    for (name, desc), value in zip(fields, position):
+        lookup = 'lt' if desc != reverse else 'gt'
+        condition |= equal & Q(**{f'{name}__{lookup}': value})
+        equal &= Q(**{name: value})
+    return condition
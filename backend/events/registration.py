@@ -0,0 +1,103 @@
+"""Registration engine shared by the register/unregister endpoints.
+
+Each operation is one transaction that leans on database constraints instead
+of read-then-write checks: the ``(event, user)`` unique constraint rejects
+duplicate registrations, and ticket capacity is claimed with a conditional
+``UPDATE ... WHERE sold < quantity`` so concurrent requests can never oversell.
+Each registration records the tier it took a seat from, and unregistering
+gives back that seat.
+The attendees M2M row, ``Event.attendee_count`` and the confirmation email all
+commit or roll back together with the registration.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .emails import queue_registration_confirmation
+from .models import Event, EventRegistration, Ticket
+
+# Give up claiming a ticket after this many lost races between tiers
+MAX_CLAIM_ATTEMPTS = 5
+
+
+class RegistrationError(Exception):
+    message = 'Registration failed'
+
+    def __init__(self, message=None):
+        super().__init__(message or self.message)
+
+
+class AlreadyRegistered(RegistrationError):
+    message = 'Already registered for this event'
+
+
+class NotRegistered(RegistrationError):
+    message = 'Not registered for this event'
+
+
+class SoldOut(RegistrationError):
+    message = 'This event is sold out'
+
+
+def _claim_ticket(event_id):
+    """Take one seat from the event's cheapest ticket tier with seats left.
+
+    Returns the id of the tier, or None for events without tickets, which have
+    unlimited capacity. Raises ``SoldOut`` when all of the tickets are sold.
+    """
+    for _ in range(MAX_CLAIM_ATTEMPTS):
+        available = (Ticket.objects.filter(event_id=event_id, sold__lt=F('quantity'))
+                     .order_by('price', 'id').values_list('id', flat=True).first())
+        if available is None:
+            if Ticket.objects.filter(event_id=event_id).exists():
+                raise SoldOut()
+            return None
+        # Re-checked by the UPDATE itself; zero rows means another request won the race
+        if Ticket.objects.filter(pk=available, sold__lt=F('quantity')).update(sold=F('sold') + 1):
+            return available
+    raise SoldOut()
+
+
+def _release_ticket(ticket_id):
+    if ticket_id is not None:
+        Ticket.objects.filter(pk=ticket_id, sold__gt=0).update(sold=F('sold') - 1)
+
+
+def register_attendee(event, user, attendee):
+    """Register ``user`` for ``event`` with the validated ``attendee`` details"""
+    Attendance = Event.attendees.through
+    try:
+        with transaction.atomic():
+            # A duplicate rolls the claimed seat back with everything else
+            ticket_id = _claim_ticket(event.pk)
+            registration = EventRegistration.objects.create(
+                event=event, user_id=user.pk, ticket_id=ticket_id, **attendee
+            )
+
+            # Also add to attendees for backward compatibility
+            Attendance.objects.bulk_create(
+                [Attendance(event_id=event.pk, customuser_id=user.pk)], ignore_conflicts=True
+            )
+            Event.objects.filter(pk=event.pk).update(attendee_count=F('attendee_count') + 1)
+
+            # Confirmation is delivered by the send_outbox_emails worker
+            queue_registration_confirmation(registration)
+    except (IntegrityError, SoldOut):
+        # Checked after the rollback; a registered user hears that first, even when sold out
+        if EventRegistration.objects.filter(event=event, user_id=user.pk).exists():
+            raise AlreadyRegistered()
+        raise
+    return registration
+
+
+def unregister_attendee(event, user):
+    Attendance = Event.attendees.through
+    with transaction.atomic():
+        registration = EventRegistration.objects.filter(event=event, user_id=user.pk)
+        ticket_id = registration.select_for_update().values_list('ticket_id', flat=True).first()
+        deleted = registration.delete()[1].get(EventRegistration._meta.label, 0)
+        if not deleted:
+            raise NotRegistered()
+
+        Attendance.objects.filter(event_id=event.pk, customuser_id=user.pk).delete()
+        Event.objects.filter(pk=event.pk, attendee_count__gt=0).update(attendee_count=F('attendee_count') - 1)
+        _release_ticket(ticket_id)
@@ -0,0 +1,142 @@
+"""Renderers and parsers for the API.
+
+``FastJSONRenderer`` and ``FastJSONParser`` are drop-in replacements for
+DRF's JSON renderer and parser. Output matches what ``JSONRenderer``
+produces in the default compact, unicode, strict mode, except that floats
+needing an exponent are written in the shorter form (``1e20`` rather than
+``1e+20``), and NaN and infinities are written as ``null`` where strict
+``JSONRenderer`` raises ``ValueError``. Anything orjson cannot reproduce
+(indented output, ``ensure_ascii``, non-UTF-8 request bodies), and every
+request when orjson is missing, goes through the stdlib classes instead.
+
+``CSVRenderer`` and ``NDJSONRenderer`` encode row exports a line at a time.
+"""
+import csv
+import re
+
+from rest_framework import renderers
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser, get_encoding
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    orjson = None
+
+if orjson is not None:
+    # Datetimes go through DRF's encoder, which trims microseconds to
+    # milliseconds; non-string keys are stringified as json.dumps does
+    ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+_encoder = JSONEncoder()
+
+
+def dumps(data):
+    """Encode ``data`` as compact UTF-8 JSON bytes, like ``JSONRenderer``"""
+    if orjson is None:
+        return renderers.JSONRenderer().render(data)
+    content = orjson.dumps(data, default=_encoder.default, option=ORJSON_OPTIONS)
+    # Keep the output a strict JavaScript subset, as JSONRenderer does
+    if b'\xe2\x80\xa8' in content or b'\xe2\x80\xa9' in content:
+        content = content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+    return content
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if (orjson is None or self.ensure_ascii or not self.compact or not self.strict
+                or self.get_indent(accepted_media_type, renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            return dumps(data)
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits; let json.dumps decide
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+class FastJSONParser(JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = get_encoding(parser_context or {})
+        if orjson is None or not self.strict or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+
+class RowRenderer(renderers.BaseRenderer):
+    """Base for renderers that write one line per row.
+
+    ``stream(rows)`` yields the output in chunks of about ``chunk_size``
+    bytes for ``StreamingHttpResponse``; ``render`` returns it whole, for
+    regular responses such as errors. ``columns`` names the fields of each
+    row, for formats with a header; by default they are the first row's keys.
+    """
+    charset = 'utf-8'
+    chunk_size = 64 * 1024
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return b''.join(self.lines([data] if isinstance(data, dict) else data))
+
+    def stream(self, rows, columns=None):
+        # One write per line would mean one socket send per row
+        chunk, size = [], 0
+        for line in self.lines(rows, columns):
+            chunk.append(line)
+            size += len(line)
+            if size >= self.chunk_size:
+                yield b''.join(chunk)
+                chunk, size = [], 0
+        if chunk:
+            yield b''.join(chunk)
+
+    def lines(self, rows, columns=None):
+        raise NotImplementedError
+
+
+class _LineBuffer:
+    def write(self, value):
+        return value
+
+
+# Spreadsheets evaluate cells starting with these as formulas. "+"/"-" also
+# start phone numbers, so those are only escaped when followed by more.
+FORMULA_RE = re.compile(r'[=@\t\r]|[+-](?![\d\s()-]*$)')
+
+
+class CSVRenderer(RowRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+
+    def lines(self, rows, columns=None):
+        writer = csv.writer(_LineBuffer())
+        if columns is not None:
+            # Written even when there are no rows
+            yield writer.writerow(columns).encode()
+        for row in rows:
+            if columns is None:
+                columns = list(row)
+                yield writer.writerow(columns).encode()
+            yield writer.writerow([self.cell(row[column]) for column in columns]).encode()
+
+    def cell(self, value):
+        if isinstance(value, str) and FORMULA_RE.match(value):
+            return "'" + value
+        return value
+
+
+class NDJSONRenderer(RowRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+    def lines(self, rows, columns=None):
+        for row in rows:
+            yield dumps(row) + b'\n'
@@ -0,0 +1,193 @@
+"""Full-text search over events.
+
+Each database vendor gets a side table holding an inverted index of an event's
+title, description, location and category name:
+
+* SQLite: an FTS5 virtual table ranked with ``bm25()``
+* PostgreSQL: a ``tsvector`` column with a GIN index ranked with ``ts_rank()``
+
+Both are filled with ``INSERT ... SELECT`` from the events table, so a single
+code path serves the migration backfill, the ``rebuild_search_index`` command
+and the save/delete signals. A search ranks its matches once inside the index
+and keeps the ids of the best ``SEARCH_MAX_RESULTS``, memoized on the request
+so the filter backend and the view share one index lookup. Other vendors fall
+back to unranked ``icontains`` matching.
+"""
+import re
+
+from django.db import connections
+from django.db.models import Q
+from rest_framework.filters import BaseFilterBackend
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+# Searches return at most this many of the best-ranked matches
+SEARCH_MAX_RESULTS = 1000
+
+# Columns fed into the index, in the order the backends expect them
+SOURCE_SQL = """
+    SELECT e.id, e.title, e.description, e.location_name, COALESCE(c.name, '')
+    FROM events_event e LEFT JOIN events_category c ON c.id = e.category_id
+"""
+
+
+class SQLiteSearchBackend:
+    table = 'events_event_fts'
+
+    def install(self, cursor):
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} USING fts5("
+            "title, description, location_name, category, tokenize='unicode61 remove_diacritics 2')"
+        )
+
+    def uninstall(self, cursor):
+        cursor.execute(f'DROP TABLE IF EXISTS {self.table}')
+
+    def rebuild(self, cursor):
+        cursor.execute(f'DELETE FROM {self.table}')
+        cursor.execute(f'INSERT INTO {self.table} (rowid, title, description, location_name, category) {SOURCE_SQL}')
+
+    def index(self, cursor, event_ids):
+        placeholders = ', '.join(['%s'] * len(event_ids))
+        self.remove(cursor, event_ids)
+        cursor.execute(
+            f'INSERT INTO {self.table} (rowid, title, description, location_name, category) '
+            f'{SOURCE_SQL} WHERE e.id IN ({placeholders})',
+            list(event_ids),
+        )
+
+    def remove(self, cursor, event_ids):
+        placeholders = ', '.join(['%s'] * len(event_ids))
+        cursor.execute(f'DELETE FROM {self.table} WHERE rowid IN ({placeholders})', list(event_ids))
+
+    def to_query(self, words):
+        # Every word must match, each as a prefix
+        return ' '.join(f'"{word}"*' for word in words)
+
+    def search(self, cursor, query, limit):
+        # Title weighs most, description least
+        cursor.execute(
+            f'SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s '
+            f'ORDER BY bm25({self.table}, 10.0, 1.0, 2.0, 4.0) LIMIT %s',
+            [query, limit],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+class PostgresSearchBackend:
+    table = 'events_event_search'
+    document_sql = (
+        "setweight(to_tsvector('english', src.title), 'A') || "
+        "setweight(to_tsvector('english', src.category), 'B') || "
+        "setweight(to_tsvector('english', src.location_name), 'B') || "
+        "setweight(to_tsvector('english', src.description), 'C')"
+    )
+
+    def install(self, cursor):
+        cursor.execute(
+            f'CREATE TABLE IF NOT EXISTS {self.table} ('
+            'event_id bigint PRIMARY KEY REFERENCES events_event (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, '
+            'document tsvector NOT NULL)'
+        )
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS {self.table}_document_gin ON {self.table} USING gin (document)')
+
+    def uninstall(self, cursor):
+        cursor.execute(f'DROP TABLE IF EXISTS {self.table}')
+
+    def _upsert(self, cursor, where='', params=()):
+        cursor.execute(
+            f'INSERT INTO {self.table} (event_id, document) '
+            f'SELECT src.id, {self.document_sql} '
+            f'FROM ({SOURCE_SQL} {where}) AS src (id, title, description, location_name, category) '
+            'ON CONFLICT (event_id) DO UPDATE SET document = EXCLUDED.document',
+            list(params),
+        )
+
+    def rebuild(self, cursor):
+        cursor.execute(f'TRUNCATE {self.table}')
+        self._upsert(cursor)
+
+    def index(self, cursor, event_ids):
+        placeholders = ', '.join(['%s'] * len(event_ids))
+        self._upsert(cursor, f'WHERE e.id IN ({placeholders})', event_ids)
+
+    def remove(self, cursor, event_ids):
+        placeholders = ', '.join(['%s'] * len(event_ids))
+        cursor.execute(f'DELETE FROM {self.table} WHERE event_id IN ({placeholders})', list(event_ids))
+
+    def to_query(self, words):
+        return ' & '.join(f'{word}:*' for word in words)
+
+    def search(self, cursor, query, limit):
+        cursor.execute(
+            f"SELECT event_id FROM {self.table}, to_tsquery('english', %s) AS query "
+            'WHERE document @@ query ORDER BY ts_rank(document, query) DESC, event_id LIMIT %s',
+            [query, limit],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+BACKENDS = {
+    'sqlite': SQLiteSearchBackend(),
+    'postgresql': PostgresSearchBackend(),
+}
+
+
+def get_backend(connection):
+    """Return the search backend for ``connection``, or None if it has none"""
+    return BACKENDS.get(connection.vendor)
+
+
+def index_events(event_ids, using='default'):
+    backend = get_backend(connections[using])
+    if backend and event_ids:
+        with connections[using].cursor() as cursor:
+            backend.index(cursor, list(event_ids))
+
+
+def remove_events(event_ids, using='default'):
+    backend = get_backend(connections[using])
+    if backend and event_ids:
+        with connections[using].cursor() as cursor:
+            backend.remove(cursor, list(event_ids))
+
+
+def rebuild_index(using='default'):
+    backend = get_backend(connections[using])
+    if backend:
+        with connections[using].cursor() as cursor:
+            backend.rebuild(cursor)
+
+
+def ranked_event_ids(request, using='default'):
+    """Return best-first ids of events matching ``?search=``.
+
+    None means the request is not a ranked search: there is no search term,
+    or the database has no full-text backend.
+    """
+    if not hasattr(request, '_search_ranking'):
+        request._search_ranking = None
+        words = WORD_RE.findall(request.query_params.get('search', '').lower())
+        backend = get_backend(connections[using])
+        if words and backend:
+            with connections[using].cursor() as cursor:
+                request._search_ranking = backend.search(cursor, backend.to_query(words), SEARCH_MAX_RESULTS)
+    return request._search_ranking
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """Restrict to events matching ``?search=`` in the full-text index"""
+    search_param = 'search'
+    fallback_fields = ['title', 'description', 'location_name', 'category__name']
+
+    def filter_queryset(self, request, queryset, view):
+        ranked_ids = ranked_event_ids(request, queryset.db)
+        if ranked_ids is not None:
+            return queryset.filter(pk__in=ranked_ids)
+
+        for word in WORD_RE.findall(request.query_params.get(self.search_param, '').lower()):
+            condition = Q()
+            for field in self.fallback_fields:
+                condition |= Q(**{f'{field}__icontains': word})
+            queryset = queryset.filter(condition)
+        return queryset
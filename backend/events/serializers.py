@@ -1,51 +1,174 @@
-from rest_framework import serializers
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.db.models import QuerySet
+from django.utils import timezone
+from django.utils.encoding import filepath_to_uri
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+from . import images
+from .metrics import TimedSerializerMixin
 from .models import Event, Category, EventRegistration
 from users.serializers import UserSerializer
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = ['id', 'name', 'slug']
 
-class EventSerializer(serializers.ModelSerializer):
+def datetime_formatter():
+    """Return DateTimeField's rendering with the timezone looked up once, not per value"""
+    field = serializers.DateTimeField()
+    field_timezone = field.default_timezone()
+    if field_timezone is None or api_settings.DATETIME_FORMAT.lower() != ISO_8601:
+        return field.to_representation
+
+    def format_datetime(value):
+        if value is None or not timezone.is_aware(value):
+            return field.to_representation(value)
+        value = value.astimezone(field_timezone).isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    return format_datetime
+
+
+class EventListSerializer(TimedSerializerMixin, serializers.ListSerializer):
+    """Read-only fast path for ``EventSerializer(many=True)``.
+
+    Given ``.values()`` rows from ``rows()``, each event's dict is built
+    directly instead of running the nested serializers and fields per row,
+    producing exactly the JSON ``EventSerializer`` would. Model instances go
+    through the regular field-by-field path. The ``events.E001`` system check
+    fails when the fields built here drift from ``EventSerializer``'s.
+    """
+    value_fields = [
+        'id', 'title', 'description', 'location_name', 'latitude', 'longitude',
+        'category__id', 'category__name', 'category__slug', 'date',
+        'created_by__id', 'created_by__username', 'created_by__email',
+        'created_by__first_name', 'created_by__last_name',
+        'image', 'image_variants', 'views', 'created_at', 'attendee_count',
+    ]
+
+    @classmethod
+    def rows(cls, queryset):
+        fields = list(cls.value_fields)
+        if 'is_attending_annotated' in queryset.query.annotations:
+            fields.append('is_attending_annotated')
+        return queryset.values(*fields)
+
+    def url_builder(self):
+        """Return a function turning a storage name into the URL the fields would render"""
+        request = self.context.get('request')
+        if isinstance(default_storage, FileSystemStorage):
+            # Resolve the media prefix once instead of per image
+            base_url = default_storage.base_url
+            if request is not None:
+                base_url = request.build_absolute_uri(base_url)
+            build = lambda name: base_url + filepath_to_uri(name).lstrip('/')
+        elif request is not None:
+            build = lambda name: request.build_absolute_uri(default_storage.url(name))
+        else:
+            build = default_storage.url
+
+        # Events often share images
+        urls = {}
+
+        def build_url(name):
+            url = urls.get(name)
+            if url is None:
+                url = urls[name] = build(name)
+            return url
+        return build_url
+
+    def to_representation(self, data):
+        if isinstance(data, QuerySet):
+            data = self.rows(data)
+        rows = list(data)
+        if not rows or not isinstance(rows[0], dict):
+            return super().to_representation(rows)
+
+        build_url = self.url_builder()
+        format_datetime = datetime_formatter()
+        results = []
+        for row in rows:
+            variants = row['image_variants']
+            webp = variants.get('webp')
+            results.append({
+                'id': row['id'],
+                'title': row['title'],
+                'description': row['description'],
+                'location_name': row['location_name'],
+                'latitude': float(row['latitude']),
+                'longitude': float(row['longitude']),
+                'category': {
+                    'id': row['category__id'],
+                    'name': row['category__name'],
+                    'slug': row['category__slug'],
+                } if row['category__id'] is not None else None,
+                'date': format_datetime(row['date']),
+                'created_by': {
+                    'id': row['created_by__id'],
+                    'username': row['created_by__username'],
+                    'email': row['created_by__email'],
+                    'first_name': row['created_by__first_name'],
+                    'last_name': row['created_by__last_name'],
+                },
+                'image': build_url(row['image']) if row['image'] else None,
+                'image_srcset': images.srcsets(variants, build_url),
+                'thumbnail': build_url(webp[min(webp, key=int)]) if webp else None,
+                'views': row['views'],
+                'created_at': format_datetime(row['created_at']),
+                'is_attending': bool(row.get('is_attending_annotated', False)),
+                'attendee_count': row['attendee_count'],
+            })
+        return results
+
+
+class EventSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     category = CategorySerializer(read_only=True)
     created_by = UserSerializer(read_only=True)
     category_id = serializers.SlugRelatedField(
         queryset=Category.objects.all(), slug_field='slug', source='category', write_only=True
     )
-    image = serializers.SerializerMethodField()
+    image_srcset = serializers.SerializerMethodField()
+    thumbnail = serializers.SerializerMethodField()
     is_attending = serializers.SerializerMethodField()
-    attendee_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Event
         fields = [
             'id', 'title', 'description', 'location_name', 
             'latitude', 'longitude', 'category', 'category_id',
-            'date', 'created_by', 'image', 'views', 'created_at',
+            'date', 'created_by', 'image', 'image_srcset', 'thumbnail', 'views', 'created_at',
             'is_attending', 'attendee_count'
         ]
+        list_serializer_class = EventListSerializer
     
-    def get_image(self, obj):
-        if obj.image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.image.url)
-            return obj.image.url
-        return None
+    def _build_url(self, path):
+        url = default_storage.url(path)
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
+    def get_image_srcset(self, obj):
+        # e.g. {"webp": "https://.../a-320.webp 320w, ...", "avif": "..."}
+        return images.srcsets(obj.image_variants, self._build_url)
+
+    def get_thumbnail(self, obj):
+        # Smallest WebP variant, for cards and previews
+        sizes = obj.image_variants.get('webp')
+        if not sizes:
+            return None
+        return self._build_url(sizes[min(sizes, key=int)])
 
     def get_is_attending(self, obj):
+        # Use annotated value if available to avoid N+1 queries
+        annotated = getattr(obj, 'is_attending_annotated', None)
+        if annotated is not None:
+            return annotated
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             return obj.attendees.filter(id=request.user.id).exists()
         return False
 
-    def get_attendee_count(self, obj):
-        # Use annotated value if available to avoid N+1 queries
-        return getattr(obj, 'attendee_count_annotated', obj.attendees.count())
-
 
-class EventRegistrationSerializer(serializers.ModelSerializer):
+class EventRegistrationSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Serializer for event registration with attendee details"""
     class Meta:
         model = EventRegistration
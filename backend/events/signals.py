@@ -0,0 +1,72 @@
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from . import search
+from .caching import response_cache, user_scope
+from .hotset import upcoming_events
+from .models import Category, Event, EventRegistration
+
+
+@receiver(post_save, sender=Event)
+def index_event(sender, instance, using, **kwargs):
+    search.index_events([instance.pk], using=using)
+
+
+@receiver(post_save, sender=Event)
+def drop_stale_image_variants(sender, instance, using, **kwargs):
+    # Encoded later by generate_image_variants; until then clients get the original
+    if instance.image_variants and instance.image_variants.get('source') != instance.image.name:
+        instance.image_variants = {}
+        Event.objects.using(using).filter(pk=instance.pk).update(image_variants={})
+
+
+@receiver(post_delete, sender=Event)
+def unindex_event(sender, instance, using, **kwargs):
+    search.remove_events([instance.pk], using=using)
+
+
+@receiver([post_save, post_delete], sender=Event)
+def update_upcoming_events(sender, instance, **kwargs):
+    upcoming_events.changed([instance.pk])
+
+
+@receiver(post_save, sender=Category)
+def reindex_category(sender, instance, using, created, **kwargs):
+    # Category names are part of each event's search document
+    if not created:
+        search.index_events(list(instance.events.values_list('id', flat=True)), using=using)
+
+
+@receiver(pre_delete, sender=Category)
+def remember_category_events(sender, instance, **kwargs):
+    instance._event_ids = list(instance.events.values_list('id', flat=True))
+
+
+@receiver(post_delete, sender=Category)
+def reindex_uncategorized(sender, instance, using, **kwargs):
+    search.index_events(getattr(instance, '_event_ids', []), using=using)
+
+
+@receiver([post_save, post_delete], sender=Category)
+def reload_upcoming_events(sender, **kwargs):
+    # Slugs and uncategorized events change without Event signals
+    upcoming_events.changed()
+
+
+# Registered last so cached responses are dropped after the receivers above
+# have finished writing
+@receiver([post_save, post_delete], sender=Event)
+def invalidate_event_responses(sender, **kwargs):
+    response_cache.invalidate('events', 'event_details')
+
+
+@receiver([post_save, post_delete], sender=EventRegistration)
+def invalidate_registration_responses(sender, instance, **kwargs):
+    # Attendee counts change for everyone, registered events only for this user
+    response_cache.invalidate('events', user_scope(instance.user_id))
+
+
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_category_responses(sender, **kwargs):
+    # Events embed their category
+    response_cache.invalidate('categories', 'events', 'event_details')
@@ -0,0 +1,138 @@
+"""Synthetic data generation for load tests and benchmarks.
+
+Rows are produced lazily by generators and written with ``bulk_create`` in
+fixed-size batches, so memory stays flat however many rows are requested.
+Every generator takes a ``start`` offset, which lets several processes fill
+disjoint ranges of the same dataset. Bulk inserts skip ``save()`` and signals,
+so call ``finalize()`` afterwards to fill the derived data (attendee counts,
+search index, trending leaderboard).
+"""
+import random
+from datetime import timedelta
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from . import geo, search
+from .caching import response_cache
+from .models import Event, EventRegistration
+from .trending import leaderboard
+
+# (name, latitude, longitude, spread in km)
+CITIES = [
+    ('Nairobi', -1.2921, 36.8219, 25),
+    ('Mombasa', -4.0435, 39.6682, 15),
+    ('Kisumu', -0.0917, 34.7680, 10),
+    ('Nakuru', -0.3031, 36.0800, 10),
+    ('Eldoret', 0.5143, 35.2698, 8),
+]
+CITY_WEIGHTS = [60, 15, 10, 10, 5]
+
+TITLE_WORDS = [
+    'Jazz', 'Tech', 'Food', 'Art', 'Comedy', 'Marathon', 'Networking', 'Business',
+    'Farmers', 'Forest', 'Music', 'Startup', 'Film', 'Book', 'Wellness', 'Dance',
+]
+TITLE_KINDS = ['Festival', 'Summit', 'Night', 'Walk', 'Mixer', 'Market', 'Exhibition', 'Meetup', 'Workshop']
+
+BATCH_SIZE = 2000
+
+
+def batched(rows, batch_size=BATCH_SIZE):
+    iterator = iter(rows)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
+
+
+def bulk_insert(model, rows, batch_size=BATCH_SIZE, ignore_conflicts=False):
+    """Stream ``rows`` into ``model``'s table and return how many were written"""
+    written = 0
+    for batch in batched(rows, batch_size):
+        model.objects.bulk_create(batch, batch_size=batch_size, ignore_conflicts=ignore_conflicts)
+        written += len(batch)
+    return written
+
+
+def generate_users(count, start=0):
+    from users.models import CustomUser
+
+    # Hashing is deliberately slow; every synthetic user shares one hash
+    password = make_password('password')
+    for n in range(start, start + count):
+        yield CustomUser(
+            email=f'user{n}@synthetic.local',
+            username=f'synthetic{n}',
+            first_name='Synthetic',
+            last_name=f'User {n}',
+            password=password,
+        )
+
+
+def generate_events(count, creator_ids, category_ids, start=0, seed=0):
+    now = timezone.now()
+    for n in range(start, start + count):
+        rng = random.Random(seed * 1_000_003 + n)
+        city, lat, lon, spread = rng.choices(CITIES, CITY_WEIGHTS)[0]
+        lat += rng.gauss(0, spread / 2) / geo.KM_PER_DEGREE
+        lon += rng.gauss(0, spread / 2) / geo.KM_PER_DEGREE
+        title = f'{rng.choice(TITLE_WORDS)} {rng.choice(TITLE_KINDS)} #{n}'
+        yield Event(
+            title=title,
+            description=f'{title} in {city}. ' + ' '.join(rng.choices(TITLE_WORDS, k=30)),
+            location_name=f'{city} venue {n % 500}',
+            latitude=lat,
+            longitude=lon,
+            geohash=geo.encode(lat, lon),
+            category_id=rng.choice(category_ids) if category_ids else None,
+            # Mostly upcoming, with a tail of past events
+            date=now + timedelta(hours=rng.randint(-24 * 60, 24 * 240)),
+            created_by_id=creator_ids[n % len(creator_ids)],
+            views=int(rng.paretovariate(1.5)) - 1,
+        )
+
+
+def registration_pairs(count, user_ids, event_ids, start=0):
+    """Yield ``count`` distinct (user_id, event_id) pairs.
+
+    User ``i % U`` registers for events ``stride * u + round`` (mod E) on
+    successive rounds, which is collision free for up to ``U * E`` pairs.
+    """
+    users, events = len(user_ids), len(event_ids)
+    count = min(count, users * events - start)
+    stride = 7919
+    for n in range(start, start + count):
+        u, r = n % users, n // users
+        yield user_ids[u], event_ids[(u * stride + r) % events]
+
+
+def generate_registrations(pairs):
+    for user_id, event_id in pairs:
+        yield EventRegistration(
+            event_id=event_id,
+            user_id=user_id,
+            attendee_name=f'Synthetic User {user_id}',
+            attendee_email=f'user{user_id}@synthetic.local',
+        )
+
+
+def generate_attendance(pairs):
+    Attendance = Event.attendees.through
+    for user_id, event_id in pairs:
+        yield Attendance(event_id=event_id, customuser_id=user_id)
+
+
+def refresh_attendee_counts():
+    attendance = Event.attendees.through.objects.filter(event_id=OuterRef('pk')).order_by().values(
+        'event_id'
+    ).annotate(total=Count('*')).values('total')
+    Event.objects.update(attendee_count=Coalesce(Subquery(attendance), 0))
+
+
+def finalize():
+    """Rebuild everything bulk inserts bypass"""
+    refresh_attendee_counts()
+    search.rebuild_index()
+    leaderboard.rebuild()
+    response_cache.invalidate('events', 'event_details', 'categories')
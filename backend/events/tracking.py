@@ -0,0 +1,145 @@
+"""Buffered view counting for events.
+
+Hits are counted in the cache instead of the database. Each worker remembers
+which events it has seen and, every ``EVENT_VIEW_FLUSH_INTERVAL`` seconds,
+folds their counters into ``Event.views`` with one ``UPDATE ... CASE``
+statement per batch. Because the counters live in the cache, a shared cache
+(Redis, file based) keeps them across worker restarts and lets the
+``flush_event_views`` command drain them from any process.
+
+A flush takes the counts out of the cache before writing them, with atomic
+decrements, so flushes running at once in several workers and the command
+never write the same views twice. It drops only the cached details of the
+events it wrote; cached lists show the new counts once they expire.
+"""
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Case, F, Value, When
+
+from .caching import event_scope, response_cache
+from .models import Event
+from .trending import leaderboard
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCounter:
+    key_prefix = 'event_views'
+
+    def __init__(self, cache_alias='default', flush_interval=30, batch_size=500):
+        self.cache_alias = cache_alias
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._dirty = set()
+        self._last_flush = time.monotonic()
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def key(self, event_id):
+        return f'{self.key_prefix}:{event_id}'
+
+    def record(self, event_id):
+        """Count one view of ``event_id``, flushing this worker's buffer when due"""
+        self._add(self.key(event_id), 1)
+
+        with self._lock:
+            self._dirty.add(event_id)
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+        if due:
+            try:
+                self.flush()
+            except Exception:
+                # Counts stay in the cache for the next flush or the command
+                logger.exception('Failed to flush buffered event views')
+
+    def flush(self, event_ids=None):
+        """Write buffered counts to the database and return how many views were flushed.
+
+        Without ``event_ids`` only the events this worker has recorded are
+        flushed; the management command passes every id instead.
+        """
+        if event_ids is None:
+            with self._lock:
+                event_ids, self._dirty = self._dirty, set()
+                self._last_flush = time.monotonic()
+
+        flushed = 0
+        batch = []
+        for event_id in event_ids:
+            batch.append(event_id)
+            if len(batch) >= self.batch_size:
+                flushed += self._flush_batch(batch)
+                batch = []
+        if batch:
+            flushed += self._flush_batch(batch)
+        return flushed
+
+    def _add(self, key, hits):
+        try:
+            self.cache.incr(key, hits)
+        except ValueError:
+            # No hits buffered since the last flush; another worker may race us to it
+            if not self.cache.add(key, hits, timeout=None):
+                self.cache.incr(key, hits)
+
+    def _take(self, event_ids):
+        """Remove the buffered counts of ``event_ids`` from the cache and return them"""
+        keys = {self.key(event_id): event_id for event_id in event_ids}
+        counts = {}
+        for key, hits in self.cache.get_many(keys).items():
+            if hits <= 0:
+                continue
+            # Subtract rather than delete, so hits recorded meanwhile stay buffered
+            try:
+                left = self.cache.decr(key, hits)
+            except ValueError:
+                continue
+            if left < 0:
+                # Another flush took some of them first; give those back
+                self.cache.incr(key, -left)
+                hits += left
+            if hits > 0:
+                counts[keys[key]] = hits
+        return counts
+
+    def _flush_batch(self, event_ids):
+        counts = self._take(event_ids)
+        if not counts:
+            return 0
+
+        try:
+            Event.objects.filter(pk__in=counts).update(views=F('views') + Case(
+                *[When(pk=event_id, then=Value(hits)) for event_id, hits in counts.items()],
+                default=Value(0),
+            ))
+        except Exception:
+            # Back into the buffer for the next flush
+            for event_id, hits in counts.items():
+                self._add(self.key(event_id), hits)
+            raise
+        leaderboard.update(list(counts))
+        response_cache.invalidate(*(event_scope(event_id) for event_id in counts))
+        return sum(counts.values())
+
+
+view_counter = ViewCounter(
+    cache_alias=getattr(settings, 'EVENT_VIEW_CACHE_ALIAS', 'default'),
+    flush_interval=getattr(settings, 'EVENT_VIEW_FLUSH_INTERVAL', 30),
+)
+
+
+@atexit.register
+def _flush_on_exit():
+    # Graceful worker restarts should not drop the last interval's views
+    try:
+        view_counter.flush()
+    except Exception:
+        logger.exception('Failed to flush buffered event views on exit')
@@ -0,0 +1,116 @@
+"""Precomputed trending leaderboard.
+
+Events are ranked by activity (views plus weighted registrations) decayed
+exponentially by age. Exponential decay multiplies every score by the same
+factor as time passes, so ranking by::
+
+    log(activity) + decay_rate * created_at
+
+gives the same order at any moment and a stored rank never goes stale on its
+own. Only events whose counts change need re-scoring. The leaderboard keeps the
+top ``size`` upcoming events overall and per category slug in the cache.
+``refresh_trending`` rebuilds it and ``update`` merges in events as their
+counts change, so serving a request is a cache read plus one ``in_bulk``.
+The board expires ``max_age`` seconds after a rebuild, however often it is
+updated, so events that have started or that changed without sending a
+signal are dropped by the next request's rebuild at the latest.
+"""
+import heapq
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+from .caching import response_cache
+from .models import Event
+
+ALL = '*'
+
+
+class Leaderboard:
+    cache_key = 'trending:leaderboard'
+
+    def __init__(self, cache_alias='default', size=50, half_life_hours=48.0, registration_weight=10.0,
+                 max_age=3600):
+        self.cache_alias = cache_alias
+        self.size = size
+        self.max_age = max_age
+        self.decay_rate = math.log(2) / (half_life_hours * 3600)
+        self.registration_weight = registration_weight
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def rank(self, views, attendee_count, created_at):
+        activity = views + self.registration_weight * attendee_count
+        return math.log1p(activity) + self.decay_rate * created_at.timestamp()
+
+    def rows(self, queryset):
+        return queryset.values_list('id', 'category__slug', 'views', 'attendee_count', 'created_at', 'date')
+
+    def rebuild(self):
+        """Recompute the leaderboard from every upcoming event in one streaming pass"""
+        heaps = {}
+        upcoming = Event.objects.filter(date__gte=timezone.now())
+        for event_id, slug, views, attendees, created_at, _ in self.rows(upcoming).iterator(chunk_size=2000):
+            entry = (self.rank(views, attendees, created_at), event_id)
+            for board in (ALL, slug) if slug else (ALL,):
+                heap = heaps.setdefault(board, [])
+                if len(heap) < self.size:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+
+        boards = {board: sorted(heap, reverse=True) for board, heap in heaps.items()}
+        self.cache.set(self.cache_key, (time.time(), boards), timeout=self.max_age)
+        response_cache.invalidate('trending')
+        return boards
+
+    def update(self, event_ids):
+        """Re-score ``event_ids`` and merge them into the cached leaderboard"""
+        stored = self.cache.get(self.cache_key)
+        if stored is None:
+            return
+        built_at, boards = stored
+        # Keeps the expiry of the last rebuild
+        remaining = built_at + self.max_age - time.time()
+        if remaining < 1:
+            return
+        now = timezone.now()
+        changed = {}
+        for event_id, slug, views, attendees, created_at, date in self.rows(Event.objects.filter(pk__in=event_ids)):
+            changed[event_id] = (slug, None if date < now else self.rank(views, attendees, created_at))
+
+        for board, entries in list(boards.items()):
+            entries = [entry for entry in entries if entry[1] not in changed]
+            entries.extend(
+                (rank, event_id) for event_id, (slug, rank) in changed.items()
+                if rank is not None and board in (ALL, slug)
+            )
+            boards[board] = heapq.nlargest(self.size, entries)
+        for event_id, (slug, rank) in changed.items():
+            if slug and slug not in boards and rank is not None:
+                boards[slug] = [(rank, event_id)]
+        self.cache.set(self.cache_key, (built_at, boards), timeout=int(remaining))
+        response_cache.invalidate('trending')
+
+    def top(self, limit, category=None):
+        """Return up to ``limit`` event ids, best first.
+
+        Events that started since the last rebuild are still listed, so callers
+        ask for more than they show.
+        """
+        stored = self.cache.get(self.cache_key)
+        boards = self.rebuild() if stored is None else stored[1]
+        return [event_id for _, event_id in boards.get(category or ALL, [])[:limit]]
+
+
+leaderboard = Leaderboard(
+    size=getattr(settings, 'TRENDING_SIZE', 50),
+    half_life_hours=getattr(settings, 'TRENDING_HALF_LIFE_HOURS', 48.0),
+    cache_alias=getattr(settings, 'TRENDING_CACHE_ALIAS', 'default'),
+    max_age=getattr(settings, 'TRENDING_MAX_AGE', 3600),
+)
@@ -1,88 +1,149 @@
-from rest_framework import viewsets, filters, status
+from django.conf import settings
+from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q, Count
-from django.core.mail import send_mail
-from django.conf import settings
+from django.db.models import Exists, OuterRef, Q, Value
+from django.http import StreamingHttpResponse
+from django.utils.dateparse import parse_datetime
 from .models import Event, Category, EventRegistration
-from .serializers import EventSerializer, CategorySerializer, EventRegistrationSerializer
-import math
+from .serializers import (
+    EventSerializer, EventListSerializer, CategorySerializer, EventRegistrationSerializer, datetime_formatter,
+)
+from .pagination import KeysetPagination
+from .search import FullTextSearchFilter, ranked_event_ids
+from .caching import cache_response, event_scope
+from .tracking import view_counter
+from .registration import AlreadyRegistered, NotRegistered, SoldOut, register_attendee, unregister_attendee
+from .trending import leaderboard
+from .hotset import upcoming_events
+from .renderers import CSVRenderer, NDJSONRenderer
+from . import geo
+
+EXPORT_FIELDS = (
+    'id', 'event_id', 'user_id', 'attendee_name', 'attendee_email', 'attendee_phone', 'registered_at',
+)
+# Names of EXPORT_FIELDS in the exported rows
+EXPORT_COLUMNS = ('id', 'event', 'user', 'attendee_name', 'attendee_email', 'attendee_phone', 'registered_at')
+# Rows fetched per round trip; memory stays flat however large the event
+EXPORT_CHUNK_SIZE = 2000
+# Largest nearby search area; bigger ones would read most of the hot set
+NEARBY_MAX_RADIUS_KM = getattr(settings, 'NEARBY_MAX_RADIUS_KM', 100)
 
 class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
 
+    @cache_response('categories')
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @cache_response('categories')
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
 from django.utils import timezone
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 
 class EventViewSet(viewsets.ModelViewSet):
-    queryset = Event.objects.all().select_related('category', 'created_by').prefetch_related('attendees').order_by('-created_at')
+    queryset = Event.objects.all().select_related('category', 'created_by').order_by('-created_at')
     serializer_class = EventSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
+    pagination_class = KeysetPagination
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter]
     filterset_fields = ['category__slug', 'created_by']
-    search_fields = ['title', 'description']
 
     def get_queryset(self):
-        queryset = super().get_queryset().annotate(attendee_count_annotated=Count('attendees'))
+        queryset = super().get_queryset()
+        user = self.request.user
+        if user.is_authenticated:
+            # Resolve membership for the whole page in the same query
+            queryset = queryset.annotate(is_attending_annotated=Exists(
+                Event.attendees.through.objects.filter(event_id=OuterRef('pk'), customuser_id=user.id)
+            ))
         category_slug = self.request.query_params.get('category')
         if category_slug:
             queryset = queryset.filter(category__slug=category_slug)
         return queryset
 
+    @property
+    def cursor_ordering(self):
+        # Every ordering ends in 'id' so cursors stay stable across ties
+        if self.action == 'registered_events':
+            # Upcoming events soonest first, anything else most recent first
+            if self.request.query_params.get('when') == 'upcoming':
+                return ('date', 'id')
+            return ('-date', '-id')
+        if self.action == 'registrations':
+            return ('-registered_at', '-id')
+        return ('-created_at', '-id')
+
+    @cache_response('events')
+    def list(self, request, *args, **kwargs):
+        ranked_ids = ranked_event_ids(request)
+        if ranked_ids is None:
+            page = self.paginate_queryset(EventListSerializer.rows(self.filter_queryset(self.get_queryset())))
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+        # Search rank order is known up front, so page over it in memory
+        matching = set(self.filter_queryset(self.get_queryset()).values_list('pk', flat=True))
+        keyed = [((position, event_id), event_id)
+                 for position, event_id in enumerate(ranked_ids) if event_id in matching]
+        page = self.paginator.paginate_keys(keyed, request)
+
+        serializer = self.get_serializer(self.event_rows(page), many=True)
+        return self.get_paginated_response(serializer.data)
+
+    def event_rows(self, ids):
+        """Load ``ids`` as rows for the list serializer's fast path, keeping their order"""
+        rows = {row['id']: row for row in EventListSerializer.rows(self.get_queryset().filter(pk__in=ids))}
+        return [rows[event_id] for event_id in ids if event_id in rows]
+
+    def retrieve(self, request, *args, **kwargs):
+        response = self.cached_retrieve(request, *args, **kwargs)
+        # Buffered; lands in Event.views on the next flush. Cache hits and
+        # 304s are views too, HEAD requests are not.
+        if request.method == 'GET' and response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            view_counter.record(int(self.kwargs['pk']))
+        return response
+
+    @cache_response('events', event_scope)
+    def cached_retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         # Assign the current user as creator
         serializer.save(created_by=self.request.user)
 
     @action(detail=False, methods=['get'])
+    @cache_response('events', 'trending')
     def trending(self, request):
-        # Return top 3 events by views
-        trending_events = self.queryset.order_by('-views')[:3]
+        # Return the top events from the precomputed leaderboard
+        try:
+            limit = trending_limit(request.query_params)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # The whole board, as events that started since the last rebuild drop out here
+        ranked_ids = leaderboard.top(leaderboard.size, request.query_params.get('category'))
+        now = timezone.now()
+        trending_events = [row for row in self.event_rows(ranked_ids) if row['date'] >= now][:limit]
         serializer = self.get_serializer(trending_events, many=True)
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'])
     def nearby(self, request):
         try:
-            lat = float(request.query_params.get('lat'))
-            lon = float(request.query_params.get('lon'))
-            radius = float(request.query_params.get('radius', 10))
-        except (TypeError, ValueError):
-            return Response(
-                {"error": "Invalid parameters. lat and lon are required numbers."}, 
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        # Bounding box filter first
-        lat_delta = radius / 111.0
-        lon_delta = radius / (111.0 * math.cos(math.radians(lat)))
-        
-        # Filter for upcoming events only
-        events = Event.objects.filter(
-            latitude__range=(lat - lat_delta, lat + lat_delta),
-            longitude__range=(lon - lon_delta, lon + lon_delta),
-            date__gte=timezone.now()  # Only show future events
-        ).order_by('date')
-        
-        # Refine with exact distance
-        nearby_events = []
-        for event in events:
-            # Haversine formula
-            dlat = math.radians(event.latitude - lat)
-            dlon = math.radians(event.longitude - lon)
-            a = (math.sin(dlat / 2) * math.sin(dlat / 2) +
-                 math.cos(math.radians(lat)) * math.cos(math.radians(event.latitude)) *
-                 math.sin(dlon / 2) * math.sin(dlon / 2))
-            c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-            distance = 6371 * c # Radius of earth in km
-            
-            if distance <= radius:
-                nearby_events.append(event)
-                
-        serializer = self.get_serializer(nearby_events, many=True)
-        serializer = self.get_serializer(nearby_events, many=True)
-        return Response(serializer.data)
+            lat, lon, radius, filters = nearby_query(request.query_params)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        keyed = nearby_keys(lat, lon, radius, filters, request.query_params.get('ordering'))
+        page = self.paginator.paginate_keys(keyed, request)
+
+        # Load full rows only for the page of events that survived
+        serializer = self.get_serializer(self.event_rows(page), many=True)
+        return self.get_paginated_response(serializer.data)
 
     @action(detail=True, methods=['post'])
     def register(self, request, pk=None):
@@ -91,10 +152,6 @@ class EventViewSet(viewsets.ModelViewSet):
         if not request.user.is_authenticated:
             return Response({"error": "Authentication required"}, status=status.HTTP_401_UNAUTHORIZED)
         
-        # Check if already registered
-        if EventRegistration.objects.filter(event=event, user=request.user).exists():
-            return Response({"error": "Already registered for this event"}, status=status.HTTP_400_BAD_REQUEST)
-        
         # Get registration data from request
         data = {
             'attendee_name': request.data.get('attendee_name'),
@@ -104,49 +161,23 @@ class EventViewSet(viewsets.ModelViewSet):
         
         # Validate and create registration
         serializer = EventRegistrationSerializer(data=data)
-        if serializer.is_valid():
-            registration = serializer.save(event=event, user=request.user)
-            
-            # Also add to attendees for backward compatibility
-            event.attendees.add(request.user)
-            
-            # Send confirmation email
-            print(f"Attempting to send email to {registration.attendee_email}...")
-            try:
-                sent_count = send_mail(
-                    subject=f'Registration Confirmation - {event.title}',
-                    message=f'''Dear {registration.attendee_name},
-
-Thank you for registering for {event.title}!
-
-Event Details:
-- Event: {event.title}
-- Date: {event.date.strftime("%B %d, %Y at %I:%M %p")}
-- Location: {event.location_name}
-
-We look forward to seeing you there!
-
-Best regards,
-The Events Team
-''',
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=[registration.attendee_email],
-                    fail_silently=False,  # Changed to False to see errors
-                )
-                print(f"Email sent successfully! Count: {sent_count}")
-            except Exception as e:
-                print(f"CRITICAL ERROR sending email: {e}")
-                import traceback
-                traceback.print_exc()
-            
-            return Response({
-                "status": "registered",
-                "is_attending": True,
-                "registration": EventRegistrationSerializer(registration).data
-            })
-        else:
+        if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+        try:
+            registration = register_attendee(event, request.user, serializer.validated_data)
+        except AlreadyRegistered as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except SoldOut as e:
+            return Response({"error": str(e)}, status=status.HTTP_409_CONFLICT)
+        leaderboard.update([event.pk])
+
+        return Response({
+            "status": "registered",
+            "is_attending": True,
+            "registration": EventRegistrationSerializer(registration).data
+        })
+
     @action(detail=True, methods=['post'])
     def unregister(self, request, pk=None):
         """Unregister from an event"""
@@ -154,32 +185,37 @@ The Events Team
         if not request.user.is_authenticated:
             return Response({"error": "Authentication required"}, status=status.HTTP_401_UNAUTHORIZED)
         
-        # Delete registration record
-        deleted_count, _ = EventRegistration.objects.filter(event=event, user=request.user).delete()
-        
-        if deleted_count > 0:
-            # Also remove from attendees
-            event.attendees.remove(request.user)
-            return Response({"status": "unregistered", "is_attending": False})
-        else:
-            return Response({"error": "Not registered for this event"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            unregister_attendee(event, request.user)
+        except NotRegistered as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        leaderboard.update([event.pk])
+        return Response({"status": "unregistered", "is_attending": False})
 
     @action(detail=False, methods=['get'])
+    @cache_response('event_details', per_user=True)
     def registered_events(self, request):
-        """Get all events the current user has registered for"""
+        """Get the events the current user has registered for, optionally ?when=upcoming|past"""
         if not request.user.is_authenticated:
             return Response({"error": "Authentication required"}, status=status.HTTP_401_UNAUTHORIZED)
+
+        when = request.query_params.get('when')
+        if when not in (None, 'upcoming', 'past'):
+            return Response({"error": "when must be 'upcoming' or 'past'"}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Joined through the registration's (user, event) index; every event
+        # here is attended, so no per-row membership check either
+        events = self.get_queryset().filter(registrations__user_id=request.user.id).annotate(
+            is_attending_annotated=Value(True)
+        )
+        if when == 'upcoming':
+            events = events.filter(date__gte=timezone.now())
+        elif when == 'past':
+            events = events.filter(date__lt=timezone.now())
+        page = self.paginate_queryset(EventListSerializer.rows(events))
         
-        # Get all event IDs where user has a registration
-        registered_event_ids = EventRegistration.objects.filter(
-            user=request.user
-        ).values_list('event_id', flat=True)
-        
-        # Get the actual events
-        events = Event.objects.filter(id__in=registered_event_ids).order_by('-date')
-        
-        serializer = self.get_serializer(events, many=True)
-        return Response(serializer.data)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
     @action(detail=True, methods=['get'])
     def registrations(self, request, pk=None):
@@ -190,13 +226,139 @@ The Events Team
         if not request.user.is_authenticated:
             return Response({"error": "Authentication required"}, status=status.HTTP_401_UNAUTHORIZED)
             
-        if event.created_by != request.user:
+        if event.created_by_id != request.user.id:
             return Response(
                 {"error": "You do not have permission to view registrations for this event"}, 
                 status=status.HTTP_403_FORBIDDEN
             )
             
         # Get registrations
-        registrations = EventRegistration.objects.filter(event=event).order_by('-registered_at')
-        serializer = EventRegistrationSerializer(registrations, many=True)
-        return Response(serializer.data)
+        registrations = EventRegistration.objects.filter(event=event)
+        page = self.paginate_queryset(registrations)
+        serializer = EventRegistrationSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=['get'], url_path='registrations/export',
+            renderer_classes=[CSVRenderer, NDJSONRenderer])
+    def export_registrations(self, request, pk=None):
+        """Stream all registrations for an event as CSV or NDJSON (only for event creator)"""
+        event = self.get_object()
+
+        if not request.user.is_authenticated:
+            return Response({"error": "Authentication required"}, status=status.HTTP_401_UNAUTHORIZED)
+
+        if event.created_by_id != request.user.id:
+            return Response(
+                {"error": "You do not have permission to view registrations for this event"},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        # Oldest first, so ?since=<last registered_at>&since_id=<last id> picks
+        # up where a sync left off
+        registrations = EventRegistration.objects.filter(event=event).order_by('registered_at', 'id')
+        since = request.query_params.get('since')
+        if since:
+            since = query_datetime(since)
+            if since is None:
+                return Response({"error": "since must be an ISO 8601 datetime"}, status=status.HTTP_400_BAD_REQUEST)
+            after = Q(registered_at__gt=since)
+            since_id = request.query_params.get('since_id')
+            if since_id:
+                try:
+                    since_id = int(since_id)
+                except ValueError:
+                    return Response({"error": "since_id must be a number"}, status=status.HTTP_400_BAD_REQUEST)
+                # Registrations sharing the last timestamp are ordered by id
+                after |= Q(registered_at=since, id__gt=since_id)
+            registrations = registrations.filter(after)
+
+        renderer = request.accepted_renderer
+        response = StreamingHttpResponse(
+            renderer.stream(registration_rows(registrations), EXPORT_COLUMNS),
+            content_type=f'{renderer.media_type}; charset={renderer.charset}',
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="event-{event.pk}-registrations.{renderer.format}"'
+        )
+        return response
+
+
+def query_datetime(value):
+    """Parse an ISO 8601 query parameter, in the current timezone if it has none; None if invalid"""
+    try:
+        parsed = parse_datetime(value)
+    except ValueError:
+        return None
+    if parsed is not None and timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def trending_limit(params):
+    """Parse ``trending``'s ``limit``, capped to the leaderboard size.
+
+    Raises ValueError with the message for the client.
+    """
+    try:
+        limit = int(params.get('limit', 3))
+    except ValueError:
+        raise ValueError("limit must be a number")
+    return max(1, min(limit, leaderboard.size))
+
+
+def nearby_query(params):
+    """Parse ``nearby``'s query parameters into ``(lat, lon, radius, filters)``.
+
+    ``filters`` are the ``upcoming_events.candidates`` arguments other than
+    the box. Raises ValueError with the message for the client.
+    """
+    try:
+        lat = float(params.get('lat'))
+        lon = float(params.get('lon'))
+        radius = float(params.get('radius', 10))
+    except (TypeError, ValueError):
+        raise ValueError("Invalid parameters. lat and lon are required numbers.")
+    # NaN fails every comparison, so it is rejected along with out-of-range values
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise ValueError("Invalid parameters. lat must be within -90..90 and lon within -180..180.")
+    if not 0 < radius <= NEARBY_MAX_RADIUS_KM:
+        raise ValueError(f"radius must be greater than 0 and at most {NEARBY_MAX_RADIUS_KM:g} km")
+
+    filters = {'category': params.get('category') or None}
+    for name in ('after', 'before'):
+        value = params.get(name)
+        if value:
+            filters[name] = query_datetime(value)
+            if filters[name] is None:
+                raise ValueError(f"{name} must be an ISO 8601 datetime")
+    return lat, lon, radius, filters
+
+
+def nearby_keys(lat, lon, radius, filters, ordering=None):
+    """Pagination keys of the upcoming events within ``radius`` km, closest first or by ``ordering='date'``"""
+    # Candidates come from the cells covering the search area, in memory
+    ids, lats, lons, starts = upcoming_events.candidates(geo.bounding_box(lat, lon, radius), **filters)
+    # Refine with exact distance over the candidate columns
+    hits = geo.refine(lat, lon, radius, ids, lats, lons)
+
+    if ordering == 'date':
+        # Soonest first
+        timestamps = dict(zip(ids, starts))
+        return sorted(((timestamps[event_id], event_id), event_id) for _, event_id in hits)
+    return [((distance, event_id), event_id) for distance, event_id in hits]
+
+
+def registration_rows(registrations):
+    """Yield export rows for ``registrations``, read through a database cursor in chunks"""
+    format_datetime = datetime_formatter()
+    rows = registrations.values_list(*EXPORT_FIELDS).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    for registration_id, event_id, user_id, name, email, phone, registered_at in rows:
+        yield {
+            'id': registration_id,
+            'event': event_id,
+            'user': user_id,
+            'attendee_name': name,
+            'attendee_email': email,
+            'attendee_phone': phone,
+            'registered_at': format_datetime(registered_at),
+        }
@@ -0,0 +1,178 @@
+"""Database profiles and read-replica routing.
+
+``database_profile`` tunes a ``DATABASES`` entry for many concurrent workers:
+
+* SQLite runs in WAL mode, so readers never block the writer, and write
+  transactions start ``IMMEDIATE``, waiting up to ``SQLITE_BUSY_TIMEOUT_MS``
+  for the write lock instead of failing with "database is locked" when two
+  transactions try to upgrade from read to write at once.
+* PostgreSQL connections are health-checked before reuse, and with
+  ``DATABASE_POOL`` they come from a per-worker psycopg pool, so adding
+  workers adds at most ``DATABASE_POOL_MAX_SIZE`` connections each.
+
+``ReplicaRouter`` and ``ReplicaMiddleware`` send the reads of GET and HEAD
+requests to the ``REPLICA_DATABASES`` aliases, except for clients that wrote
+in the last ``REPLICA_PIN_SECONDS``. Everything else, and every write, uses
+``default``.
+"""
+import contextvars
+import random
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS
+
+SQLITE_BUSY_TIMEOUT_MS = 20_000
+SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+
+SQLITE_PRAGMAS = (
+    'PRAGMA journal_mode = WAL',
+    # Durable in WAL mode except for the last commits before a power loss
+    'PRAGMA synchronous = NORMAL',
+    f'PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}',
+    f'PRAGMA mmap_size = {SQLITE_MMAP_SIZE}',
+    'PRAGMA temp_store = MEMORY',
+)
+
+
+def database_profile(database, pool=False, pool_max_size=10):
+    """Return ``database`` (a ``DATABASES`` entry) tuned for its engine"""
+    options = database.setdefault('OPTIONS', {})
+    engine = database['ENGINE']
+    if engine == 'django.db.backends.sqlite3':
+        options.setdefault('init_command', ';'.join(SQLITE_PRAGMAS))
+        options.setdefault('transaction_mode', 'IMMEDIATE')
+    elif engine == 'django.db.backends.postgresql':
+        database['CONN_HEALTH_CHECKS'] = True
+        if pool:
+            # Pooled connections are returned to the pool after each request
+            database['CONN_MAX_AGE'] = 0
+            options.setdefault('pool', {'min_size': 1, 'max_size': pool_max_size, 'timeout': 10})
+    return database
+
+
+WRITE_METHODS = {'POST', 'PUT', 'PATCH', 'DELETE'}
+PIN_COOKIE = 'primary_pin'
+
+_use_replica = contextvars.ContextVar('use_replica', default=False)
+
+
+@contextmanager
+def read_replica():
+    """Route reads inside the block to a replica, when there are any"""
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+@contextmanager
+def read_primary():
+    """Route reads inside the block to the primary, even within ``read_replica``"""
+    token = _use_replica.set(False)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replicas = getattr(settings, 'REPLICA_DATABASES', ())
+        if replicas and _use_replica.get():
+            return random.choice(replicas)
+        # No opinion: related objects load from their instance's database
+        return None
+
+    def db_for_write(self, model, **hints):
+        # Even for objects that were read from a replica
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive the schema from the primary
+        return db not in getattr(settings, 'REPLICA_DATABASES', ())
+
+
+class ReplicaMiddleware:
+    """Serve GET and HEAD requests from the read replicas.
+
+    A client that has just written is pinned to the primary for
+    ``REPLICA_PIN_SECONDS``, so it reads its own writes while the replicas
+    catch up. The pin is a cookie and, for clients that send a bearer token
+    but no cookies, a cache entry for the token's user, which holds across
+    token refreshes.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REPLICA_DATABASES', ()):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.pin_seconds = getattr(settings, 'REPLICA_PIN_SECONDS', 5)
+        self.cache = caches[getattr(settings, 'REPLICA_PIN_CACHE_ALIAS', 'default')]
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if request.method in ('GET', 'HEAD'):
+            if self.is_pinned(request):
+                return self.get_response(request)
+            with read_replica():
+                return self.get_response(request)
+
+        response = self.get_response(request)
+        if request.method in WRITE_METHODS and response.status_code < 400:
+            self.pin(request, response)
+        return response
+
+    async def __acall__(self, request):
+        if request.method in ('GET', 'HEAD'):
+            if await sync_to_async(self.is_pinned)(request):
+                return await self.get_response(request)
+            # The async ORM's worker threads inherit the flag
+            with read_replica():
+                return await self.get_response(request)
+
+        response = await self.get_response(request)
+        if request.method in WRITE_METHODS and response.status_code < 400:
+            await sync_to_async(self.pin)(request, response)
+        return response
+
+    def pin_key(self, request):
+        # Imported here, as settings import this module
+        from rest_framework.exceptions import AuthenticationFailed
+        from users.authentication import LazyJWTAuthentication
+
+        try:
+            # Verifies the token without loading the user
+            authenticated = LazyJWTAuthentication().authenticate(request)
+        except AuthenticationFailed:
+            return None
+        if authenticated is None:
+            return None
+        return f'replica-pin:{authenticated[0].id}'
+
+    def is_pinned(self, request):
+        if PIN_COOKIE in request.COOKIES:
+            return True
+        key = self.pin_key(request)
+        return key is not None and self.cache.get(key) is not None
+
+    def pin(self, request, response):
+        response.set_cookie(PIN_COOKIE, '1', max_age=self.pin_seconds, httponly=True, samesite='Lax')
+        key = self.pin_key(request)
+        if key is not None:
+            self.cache.set(key, 1, self.pin_seconds)
@@ -15,6 +15,8 @@ from decouple import config, Csv
 import dj_database_url
 import os
 
+from .database import database_profile
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -52,8 +54,12 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so its timings cover the rest of the stack
+    'events.metrics.MetricsMiddleware',
+    # Only active when REPLICA_DATABASES is set
+    'local_event.database.ReplicaMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'local_event.middleware.StaticFilesMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -103,6 +109,108 @@ DATABASES = {
 db_from_env = dj_database_url.config(conn_max_age=500)
 DATABASES['default'].update(db_from_env)
 
+# WAL and lock waits for SQLite; health checks and, with DATABASE_POOL, a
+# connection pool (needs psycopg 3) for PostgreSQL. See local_event/database.py
+DATABASE_POOL = config('DATABASE_POOL', default=False, cast=bool)
+DATABASE_POOL_MAX_SIZE = config('DATABASE_POOL_MAX_SIZE', default=10, cast=int)
+
+# Read replicas for GET/HEAD requests, e.g. postgres://...replica-1/db,postgres://...replica-2/db
+REPLICA_DATABASES = []
+for index, url in enumerate(config('DATABASE_REPLICA_URLS', default='', cast=Csv()), start=1):
+    alias = f'replica_{index}'
+    DATABASES[alias] = dj_database_url.parse(url, conn_max_age=500)
+    # Tests read the test primary through the replica aliases
+    DATABASES[alias]['TEST'] = {'MIRROR': 'default'}
+    REPLICA_DATABASES.append(alias)
+
+for database in DATABASES.values():
+    database_profile(database, pool=DATABASE_POOL, pool_max_size=DATABASE_POOL_MAX_SIZE)
+
+DATABASE_ROUTERS = ['local_event.database.ReplicaRouter']
+
+# Clients read from the primary for this long after a write (read-your-writes)
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=5, cast=int)
+
+
+# Caches
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Buffered view counters (events.tracking); shared by the workers and the
+    # flush_event_views command and kept across restarts, so it must not evict
+    # or expire keys. On disk unless REDIS_URL is set
+    'event_views': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': config('EVENT_VIEW_CACHE_DIR', default=str(BASE_DIR / 'cache' / 'event-views')),
+        'TIMEOUT': None,
+        'OPTIONS': {'MAX_ENTRIES': 1_000_000},
+    },
+    # Anonymous API responses (events.caching)
+    'responses': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'responses',
+        'OPTIONS': {'MAX_ENTRIES': 10_000},
+    },
+}
+
+# A Redis (or Redis-compatible) server shares cached responses between workers;
+# needs the redis package
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES['responses'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+    }
+    # Atomic increments; the server must not evict these keys (maxmemory-policy noeviction)
+    CACHES['event_views'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+        'TIMEOUT': None,
+    }
+
+RESPONSE_CACHE_ALIAS = 'responses'
+# Shared between workers when REDIS_URL is set, so a pin holds on any worker
+REPLICA_PIN_CACHE_ALIAS = 'responses'
+RESPONSE_CACHE_TIMEOUT = config('RESPONSE_CACHE_TIMEOUT', default=600, cast=int)
+
+EVENT_VIEW_CACHE_ALIAS = 'event_views'
+EVENT_VIEW_FLUSH_INTERVAL = config('EVENT_VIEW_FLUSH_INTERVAL', default=30, cast=int)
+
+# Trending leaderboard (events.trending); shared between workers when REDIS_URL
+# is set, and rebuilt by the first request after it expires
+TRENDING_CACHE_ALIAS = 'responses'
+TRENDING_SIZE = 50
+TRENDING_MAX_AGE = config('TRENDING_MAX_AGE', default=3600, cast=int)
+TRENDING_HALF_LIFE_HOURS = config('TRENDING_HALF_LIFE_HOURS', default=48.0, cast=float)
+
+# Largest radius accepted by /api/events/nearby/
+NEARBY_MAX_RADIUS_KM = config('NEARBY_MAX_RADIUS_KM', default=100, cast=float)
+
+# Upcoming events kept in memory by each worker for nearby (events.hotset);
+# changes reach the other workers through this cache
+UPCOMING_EVENTS_CACHE_ALIAS = 'responses'
+UPCOMING_EVENTS_RECONCILE_INTERVAL = config('UPCOMING_EVENTS_RECONCILE_INTERVAL', default=300, cast=int)
+
+# Request metrics (events.metrics), served at /metrics
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+METRICS_LOG_REQUESTS = config('METRICS_LOG_REQUESTS', default=False, cast=bool)
+SLOW_REQUEST_MS = config('SLOW_REQUEST_MS', default=500, cast=int)
+SLOW_REQUEST_SAMPLE_RATE = config('SLOW_REQUEST_SAMPLE_RATE', default=1.0, cast=float)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'events.requests': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -151,7 +259,18 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # Builds request.user from the token claims; the user row loads on first use
+        'users.authentication.LazyJWTAuthentication',
+    ),
+    # orjson-backed JSON when installed, stdlib json otherwise
+    'DEFAULT_RENDERER_CLASSES': (
+        'events.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'events.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ),
 }
 
@@ -162,6 +281,11 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Users loaded by users.authentication; shared between workers when REDIS_URL
+# is set, so saving a user drops the cached copy on every worker
+USER_CACHE_ALIAS = 'responses'
+USER_CACHE_TIMEOUT = config('USER_CACHE_TIMEOUT', default=300, cast=int)
+
 AUTHENTICATION_BACKENDS = [
     'django.contrib.auth.backends.ModelBackend',
 ]
@@ -3,6 +3,7 @@ from django.urls import path, include
 from django.shortcuts import redirect
 from django.conf import settings
 from django.conf.urls.static import static
+from events.metrics import metrics_view
 
 def root_redirect(request):
     return redirect('/api/')
@@ -10,8 +11,11 @@ def root_redirect(request):
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('events.urls')),
+    # Async variants of the hot read endpoints, for ASGI deployments
+    path('api/async/', include('events.async_urls')),
     path('api/auth/', include('djoser.urls')),
     path('api/auth/', include('djoser.urls.jwt')),
+    path('metrics', metrics_view),
     path('', root_redirect),
 ]
 
@@ -0,0 +1,89 @@
+"""JWT authentication without a user query on every request.
+
+``LazyJWTAuthentication`` trusts the verified token's claims: ``request.user``
+knows its ``id`` straight away, and only loads the full ``CustomUser`` when
+anything else is read from it. Nothing the user can change is taken from the
+token, so an edited profile shows up at once rather than when the token
+expires. Loaded rows are cached for
+``USER_CACHE_TIMEOUT`` seconds and dropped whenever the user is saved or
+deleted.
+
+Since the row is not read up front, a user who is deactivated or deleted keeps
+access to endpoints that only need their id until their access token expires
+(``ACCESS_TOKEN_LIFETIME``); anything that loads the user rejects them.
+"""
+import copy
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.functional import SimpleLazyObject, empty
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+
+def _cache():
+    return caches[getattr(settings, 'USER_CACHE_ALIAS', 'default')]
+
+
+def _cache_key(user_id):
+    return f'users:{user_id}'
+
+
+def cached_user(user_id):
+    """Return the user with ``user_id`` from the cache or database, or None"""
+    cache = _cache()
+    user = cache.get(_cache_key(user_id))
+    if user is None:
+        user = get_user_model().objects.filter(pk=user_id).first()
+        if user is not None:
+            cache.set(_cache_key(user_id), user, getattr(settings, 'USER_CACHE_TIMEOUT', 300))
+    return user
+
+
+def forget_user(user_id):
+    # After commit, so a request racing the save cannot cache the old row again
+    transaction.on_commit(lambda: _cache().delete(_cache_key(user_id)))
+
+
+def load_user(user_id):
+    user = cached_user(user_id)
+    if user is None:
+        raise AuthenticationFailed('User not found', code='user_not_found')
+    if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+        raise AuthenticationFailed('User is inactive', code='user_inactive')
+    return user
+
+
+class LazyUser(SimpleLazyObject):
+    """``request.user`` for a verified token; loads the user on first use.
+
+    ``id``, ``pk`` and the authentication flags are answered from the token
+    without loading anything.
+    """
+
+    def __init__(self, user_id):
+        super().__init__(lambda: load_user(user_id))
+        # Set on the proxy itself, as plain attributes are found before
+        # SimpleLazyObject's __getattr__ would load the user
+        self.__dict__.update(id=user_id, pk=user_id, is_authenticated=True, is_anonymous=False)
+
+    def __bool__(self):
+        return True
+
+    def __copy__(self):
+        if self._wrapped is empty:
+            return type(self)(self.id)
+        return copy.copy(self._wrapped)
+
+
+class LazyJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken('Token contained no recognizable user identification')
+        user_id = get_user_model()._meta.pk.to_python(user_id)
+        return LazyUser(user_id)
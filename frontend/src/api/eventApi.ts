@@ -1,6 +1,22 @@
 // API functions for events
 import axiosClient from "./axiosClient";
-import { Event, Category } from "@/types/event";
+import { Event, Category, CursorPage } from "@/types/event";
+
+// Fetch the first page of a cursor-paginated endpoint; pass its `next` to getNextPage for more
+const getPage = async <T>(url: string, params?: Record<string, unknown>): Promise<CursorPage<T>> => {
+  const response = await axiosClient.get<CursorPage<T>>(url, { params });
+  return response.data;
+};
+
+export interface Registration {
+  id: number;
+  event: number;
+  user: number;
+  attendee_name: string;
+  attendee_email: string;
+  attendee_phone?: string;
+  registered_at: string;
+}
 
 export const eventApi = {
   // Get all events
@@ -10,8 +26,15 @@ export const eventApi = {
     lat?: number;
     lon?: number;
     radius?: number;
-  }): Promise<Event[]> => {
-    const response = await axiosClient.get("/events/", { params });
+    created_by?: number;
+  }): Promise<CursorPage<Event>> => {
+    return getPage<Event>("/events/", params);
+  },
+
+  // Get the page after one already loaded
+  getNextPage: async <T>(next: string): Promise<CursorPage<T>> => {
+    // next is an absolute URL that already carries the query parameters
+    const response = await axiosClient.get<CursorPage<T>>(next);
     return response.data;
   },
 
@@ -28,11 +51,8 @@ export const eventApi = {
   },
 
   // Get nearby events
-  getNearbyEvents: async (lat: number, lon: number, radius: number = 10): Promise<Event[]> => {
-    const response = await axiosClient.get("/events/nearby/", {
-      params: { lat, lon, radius }
-    });
-    return response.data;
+  getNearbyEvents: async (lat: number, lon: number, radius: number = 10): Promise<CursorPage<Event>> => {
+    return getPage<Event>("/events/nearby/", { lat, lon, radius });
   },
 
   // Create new event
@@ -81,22 +101,12 @@ export const eventApi = {
   },
 
   // Get events the user has registered for
-  getRegisteredEvents: async (): Promise<Event[]> => {
-    const response = await axiosClient.get("/events/registered_events/");
-    return response.data;
+  getRegisteredEvents: async (): Promise<CursorPage<Event>> => {
+    return getPage<Event>("/events/registered_events/");
   },
 
   // Get registrations for a specific event (host only)
-  getEventRegistrations: async (id: number): Promise<{
-    id: number;
-    event: number;
-    user: number;
-    attendee_name: string;
-    attendee_email: string;
-    attendee_phone?: string;
-    registered_at: string;
-  }[]> => {
-    const response = await axiosClient.get(`/events/${id}/registrations/`);
-    return response.data;
+  getEventRegistrations: async (id: number): Promise<CursorPage<Registration>> => {
+    return getPage<Registration>(`/events/${id}/registrations/`);
   },
 };
@@ -17,11 +17,20 @@ const EventCard = ({ event }: EventCardProps) => {
         {/* Event Image */}
         <div className="relative aspect-video overflow-hidden">
           {event.image ? (
-            <img
-              src={event.image}
-              alt={event.title}
-              className="w-full h-full object-cover group-hover:scale-105 transition-transform duration-300"
-            />
+            <picture>
+              {event.image_srcset?.avif && (
+                <source type="image/avif" srcSet={event.image_srcset.avif} sizes="(min-width: 768px) 33vw, 100vw" />
+              )}
+              {event.image_srcset?.webp && (
+                <source type="image/webp" srcSet={event.image_srcset.webp} sizes="(min-width: 768px) 33vw, 100vw" />
+              )}
+              <img
+                src={event.thumbnail || event.image}
+                alt={event.title}
+                loading="lazy"
+                className="w-full h-full object-cover group-hover:scale-105 transition-transform duration-300"
+              />
+            </picture>
           ) : (
             <div className="w-full h-full bg-gradient-to-br from-primary/20 via-secondary/20 to-accent/20 flex items-center justify-center">
               <div className="text-center p-6">
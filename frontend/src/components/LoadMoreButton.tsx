@@ -0,0 +1,21 @@
+// "Load more" for cursor-paginated lists; renders nothing on the last page
+import { Button } from "@/components/ui/button";
+
+interface LoadMoreButtonProps {
+  hasMore: boolean;
+  loading: boolean;
+  onClick: () => void;
+}
+
+const LoadMoreButton = ({ hasMore, loading, onClick }: LoadMoreButtonProps) => {
+  if (!hasMore) return null;
+  return (
+    <div className="flex justify-center mt-8">
+      <Button variant="outline" onClick={onClick} disabled={loading}>
+        {loading ? "Loading..." : "Load more"}
+      </Button>
+    </div>
+  );
+};
+
+export default LoadMoreButton;
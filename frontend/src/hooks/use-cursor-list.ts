@@ -0,0 +1,32 @@
+import { useCallback, useState } from "react";
+import { eventApi } from "@/api/eventApi";
+import { CursorPage } from "@/types/event";
+
+// Items of a cursor-paginated list, one page at a time
+export function useCursorList<T>() {
+  const [items, setItems] = useState<T[]>([]);
+  const [next, setNext] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+
+  // Replace the list with a freshly fetched first page
+  const reset = useCallback((page: CursorPage<T>) => {
+    setItems(page.results);
+    setNext(page.next);
+  }, []);
+
+  const loadMore = useCallback(async () => {
+    if (!next) return;
+    setLoadingMore(true);
+    try {
+      const page = await eventApi.getNextPage<T>(next);
+      setItems((current) => [...current, ...page.results]);
+      setNext(page.next);
+    } catch (error) {
+      console.error("Error loading more:", error);
+    } finally {
+      setLoadingMore(false);
+    }
+  }, [next]);
+
+  return { items, setItems, hasMore: next !== null, loadingMore, reset, loadMore };
+}
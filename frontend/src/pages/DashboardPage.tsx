@@ -3,6 +3,7 @@ import { useState, useEffect } from "react";
 import { Link } from "react-router-dom";
 import Navbar from "@/components/Navbar";
 import Footer from "@/components/Footer";
+import LoadMoreButton from "@/components/LoadMoreButton";
 import { Button } from "@/components/ui/button";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import {
@@ -15,6 +16,7 @@ import {
 } from "@/components/ui/table";
 import { authApi } from "@/api/authApi";
 import { eventApi } from "@/api/eventApi";
+import { useCursorList } from "@/hooks/use-cursor-list";
 import { Event, User } from "@/types/event";
 import { format } from "date-fns";
 import { Plus, Settings, Users, Calendar, Trash2 } from "lucide-react";
@@ -33,7 +35,7 @@ import {
 
 const DashboardPage = () => {
     const [user, setUser] = useState<User | null>(null);
-    const [events, setEvents] = useState<Event[]>([]);
+    const { items: events, setItems: setEvents, hasMore, loadingMore, reset, loadMore } = useCursorList<Event>();
     const [loading, setLoading] = useState(true);
 
     useEffect(() => {
@@ -42,10 +44,7 @@ const DashboardPage = () => {
                 const userData = await authApi.getCurrentUser();
                 setUser(userData);
 
-                const allEvents = await eventApi.getEvents();
-                // Filter for events created by this user
-                const userEvents = allEvents.filter(e => e.created_by.id === userData.id);
-                setEvents(userEvents);
+                reset(await eventApi.getEvents({ created_by: userData.id }));
             } catch (error) {
                 console.error("Error loading dashboard:", error);
             } finally {
@@ -58,7 +57,7 @@ const DashboardPage = () => {
     const handleDelete = async (id: number) => {
         try {
             await eventApi.deleteEvent(id);
-            setEvents(events.filter(e => e.id !== id));
+            setEvents((current) => current.filter(e => e.id !== id));
             toast.success("Event deleted");
         } catch (error) {
             toast.error("Failed to delete event");
@@ -102,7 +101,7 @@ const DashboardPage = () => {
                             <Calendar className="h-4 w-4 text-muted-foreground" />
                         </CardHeader>
                         <CardContent>
-                            <div className="text-2xl font-bold">{events.length}</div>
+                            <div className="text-2xl font-bold">{events.length}{hasMore ? "+" : ""}</div>
                         </CardContent>
                     </Card>
                     <Card>
@@ -112,7 +111,7 @@ const DashboardPage = () => {
                         </CardHeader>
                         <CardContent>
                             <div className="text-2xl font-bold">
-                                {events.reduce((acc, curr) => acc + (curr.attendee_count || 0), 0)}
+                                {events.reduce((acc, curr) => acc + (curr.attendee_count || 0), 0)}{hasMore ? "+" : ""}
                             </div>
                         </CardContent>
                     </Card>
@@ -125,56 +124,59 @@ const DashboardPage = () => {
                     </CardHeader>
                     <CardContent>
                         {events.length > 0 ? (
-                            <Table>
-                                <TableHeader>
-                                    <TableRow>
-                                        <TableHead>Title</TableHead>
-                                        <TableHead>Date</TableHead>
-                                        <TableHead>Location</TableHead>
-                                        <TableHead>Attendees</TableHead>
-                                        <TableHead className="text-right">Actions</TableHead>
-                                    </TableRow>
-                                </TableHeader>
-                                <TableBody>
-                                    {events.map((event) => (
-                                        <TableRow key={event.id}>
-                                            <TableCell className="font-medium">{event.title}</TableCell>
-                                            <TableCell>{format(new Date(event.date), "PP p")}</TableCell>
-                                            <TableCell>{event.location_name}</TableCell>
-                                            <TableCell>{event.attendee_count || 0}</TableCell>
-                                            <TableCell className="text-right">
-                                                <div className="flex justify-end gap-2">
-                                                    <Button size="sm" variant="outline" asChild>
-                                                        <Link to={`/events/manage/${event.id}`}>
-                                                            <Settings className="h-4 w-4 mr-1" /> Manage
-                                                        </Link>
-                                                    </Button>
-
-                                                    <AlertDialog>
-                                                        <AlertDialogTrigger asChild>
-                                                            <Button size="sm" variant="destructive">
-                                                                <Trash2 className="h-4 w-4" />
-                                                            </Button>
-                                                        </AlertDialogTrigger>
-                                                        <AlertDialogContent>
-                                                            <AlertDialogHeader>
-                                                                <AlertDialogTitle>Delete Event?</AlertDialogTitle>
-                                                                <AlertDialogDescription>
-                                                                    This will permanently delete "{event.title}".
-                                                                </AlertDialogDescription>
-                                                            </AlertDialogHeader>
-                                                            <AlertDialogFooter>
-                                                                <AlertDialogCancel>Cancel</AlertDialogCancel>
-                                                                <AlertDialogAction onClick={() => handleDelete(event.id)}>Delete</AlertDialogAction>
-                                                            </AlertDialogFooter>
-                                                        </AlertDialogContent>
-                                                    </AlertDialog>
-                                                </div>
-                                            </TableCell>
+                            <>
+                                <Table>
+                                    <TableHeader>
+                                        <TableRow>
+                                            <TableHead>Title</TableHead>
+                                            <TableHead>Date</TableHead>
+                                            <TableHead>Location</TableHead>
+                                            <TableHead>Attendees</TableHead>
+                                            <TableHead className="text-right">Actions</TableHead>
                                         </TableRow>
-                                    ))}
-                                </TableBody>
-                            </Table>
+                                    </TableHeader>
+                                    <TableBody>
+                                        {events.map((event) => (
+                                            <TableRow key={event.id}>
+                                                <TableCell className="font-medium">{event.title}</TableCell>
+                                                <TableCell>{format(new Date(event.date), "PP p")}</TableCell>
+                                                <TableCell>{event.location_name}</TableCell>
+                                                <TableCell>{event.attendee_count || 0}</TableCell>
+                                                <TableCell className="text-right">
+                                                    <div className="flex justify-end gap-2">
+                                                        <Button size="sm" variant="outline" asChild>
+                                                            <Link to={`/events/manage/${event.id}`}>
+                                                                <Settings className="h-4 w-4 mr-1" /> Manage
+                                                            </Link>
+                                                        </Button>
+
+                                                        <AlertDialog>
+                                                            <AlertDialogTrigger asChild>
+                                                                <Button size="sm" variant="destructive">
+                                                                    <Trash2 className="h-4 w-4" />
+                                                                </Button>
+                                                            </AlertDialogTrigger>
+                                                            <AlertDialogContent>
+                                                                <AlertDialogHeader>
+                                                                    <AlertDialogTitle>Delete Event?</AlertDialogTitle>
+                                                                    <AlertDialogDescription>
+                                                                        This will permanently delete "{event.title}".
+                                                                    </AlertDialogDescription>
+                                                                </AlertDialogHeader>
+                                                                <AlertDialogFooter>
+                                                                    <AlertDialogCancel>Cancel</AlertDialogCancel>
+                                                                    <AlertDialogAction onClick={() => handleDelete(event.id)}>Delete</AlertDialogAction>
+                                                                </AlertDialogFooter>
+                                                            </AlertDialogContent>
+                                                        </AlertDialog>
+                                                    </div>
+                                                </TableCell>
+                                            </TableRow>
+                                        ))}
+                                    </TableBody>
+                                </Table>
+                                <LoadMoreButton hasMore={hasMore} loading={loadingMore} onClick={loadMore} />
+                            </>
                         ) : (
                             <div className="text-center py-12">
                                 <p className="text-muted-foreground mb-4">No events found.</p>
@@ -6,12 +6,14 @@ import Footer from "@/components/Footer";
 import EventCard from "@/components/EventCard";
 import CategoryFilter from "@/components/CategoryFilter";
 import SearchBar from "@/components/SearchBar";
+import LoadMoreButton from "@/components/LoadMoreButton";
 import { eventApi } from "@/api/eventApi";
+import { useCursorList } from "@/hooks/use-cursor-list";
 import { Event, Category } from "@/types/event";
 
 const EventsPage = () => {
   const [searchParams, setSearchParams] = useSearchParams();
-  const [events, setEvents] = useState<Event[]>([]);
+  const { items: events, hasMore, loadingMore, reset, loadMore } = useCursorList<Event>();
   const [categories, setCategories] = useState<Category[]>([]);
   const [loading, setLoading] = useState(true);
 
@@ -29,7 +31,7 @@ const EventsPage = () => {
           eventApi.getCategories(),
         ]);
 
-        setEvents(eventsData);
+        reset(eventsData);
         setCategories(categoriesData);
       } catch (error) {
         console.error("Error fetching events:", error);
@@ -39,7 +41,7 @@ const EventsPage = () => {
     };
 
     fetchData();
-  }, [selectedCategory, searchQuery]);
+  }, [selectedCategory, searchQuery, reset]);
 
   const handleCategorySelect = (slug: string | null) => {
     const newParams = new URLSearchParams(searchParams);
@@ -103,13 +105,14 @@ const EventsPage = () => {
             ) : events.length > 0 ? (
               <>
                 <div className="mb-6 text-muted-foreground">
-                  Found {events.length} events
+                  Showing {events.length}{hasMore ? "+" : ""} events
                 </div>
                 <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
                   {events.map((event) => (
                     <EventCard key={event.id} event={event} />
                   ))}
                 </div>
+                <LoadMoreButton hasMore={hasMore} loading={loadingMore} onClick={loadMore} />
               </>
             ) : (
               <div className="text-center py-20">
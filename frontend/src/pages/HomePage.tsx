@@ -6,19 +6,20 @@ import Navbar from "@/components/Navbar";
 import Footer from "@/components/Footer";
 import TrendingEvents from "@/components/TrendingEvents";
 import EventCard from "@/components/EventCard";
+import LoadMoreButton from "@/components/LoadMoreButton";
 import { eventApi } from "@/api/eventApi";
+import { useCursorList } from "@/hooks/use-cursor-list";
 import { Event } from "@/types/event";
 import { MapPin, Calendar, Users, TrendingUp } from "lucide-react";
 
 const HomePage = () => {
-  const [nearbyEvents, setNearbyEvents] = useState<Event[]>([]);
+  const { items: nearbyEvents, hasMore, loadingMore, reset, loadMore } = useCursorList<Event>();
   const [loading, setLoading] = useState(true);
 
   const fetchEvents = async (lat: number, lon: number) => {
     setLoading(true);
     try {
-      const events = await eventApi.getNearbyEvents(lat, lon);
-      setNearbyEvents(events);
+      reset(await eventApi.getNearbyEvents(lat, lon));
     } catch (error) {
       console.error("Error fetching nearby events:", error);
     } finally {
@@ -43,7 +44,7 @@ const HomePage = () => {
         await fetchEvents(parseFloat(lat), parseFloat(lon));
       } else {
         // Handle location not found
-        setNearbyEvents([]);
+        reset({ next: null, previous: null, results: [] });
         setLoading(false);
       }
     } catch (error) {
@@ -170,11 +171,14 @@ const HomePage = () => {
                 <div className="animate-spin rounded-full h-8 w-8 border-b-2 border-primary"></div>
               </div>
             ) : nearbyEvents.length > 0 ? (
-              <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-4 gap-6">
-                {nearbyEvents.map((event) => (
-                  <EventCard key={event.id} event={event} />
-                ))}
-              </div>
+              <>
+                <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-4 gap-6">
+                  {nearbyEvents.map((event) => (
+                    <EventCard key={event.id} event={event} />
+                  ))}
+                </div>
+                <LoadMoreButton hasMore={hasMore} loading={loadingMore} onClick={loadMore} />
+              </>
             ) : (
               <div className="text-center py-12 text-muted-foreground">
                 <p className="text-lg">No upcoming events found in this area.</p>
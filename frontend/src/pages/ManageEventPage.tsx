@@ -4,6 +4,7 @@ import { useParams, useNavigate } from "react-router-dom";
 import Navbar from "@/components/Navbar";
 import Footer from "@/components/Footer";
 import EventForm from "@/components/EventForm";
+import LoadMoreButton from "@/components/LoadMoreButton";
 import { Button } from "@/components/ui/button";
 import { Tabs, TabsContent, TabsList, TabsTrigger } from "@/components/ui/tabs";
 import { Card, CardContent, CardHeader, CardTitle, CardDescription } from "@/components/ui/card";
@@ -26,25 +27,24 @@ import {
     AlertDialogTitle,
     AlertDialogTrigger,
 } from "@/components/ui/alert-dialog";
-import { eventApi } from "@/api/eventApi";
+import { eventApi, Registration } from "@/api/eventApi";
+import { useCursorList } from "@/hooks/use-cursor-list";
 import { Event } from "@/types/event";
 import { toast } from "sonner";
 import { MapPin, Calendar, Trash2, Users, Edit, RefreshCcw } from "lucide-react";
 import { format } from "date-fns";
 
-interface Registration {
-    id: number;
-    attendee_name: string;
-    attendee_email: string;
-    attendee_phone?: string;
-    registered_at: string;
-}
-
 const ManageEventPage = () => {
     const { id } = useParams<{ id: string }>();
     const navigate = useNavigate();
     const [event, setEvent] = useState<Event | null>(null);
-    const [registrations, setRegistrations] = useState<Registration[]>([]);
+    const {
+        items: registrations,
+        hasMore: hasMoreRegistrations,
+        loadingMore: loadingMoreRegistrations,
+        reset: resetRegistrations,
+        loadMore: loadMoreRegistrations,
+    } = useCursorList<Registration>();
     const [loading, setLoading] = useState(true);
     const [loadingRegistrations, setLoadingRegistrations] = useState(false);
     const [saving, setSaving] = useState(false);
@@ -74,8 +74,7 @@ const ManageEventPage = () => {
     const loadRegistrations = async (eventId: number) => {
         setLoadingRegistrations(true);
         try {
-            const data = await eventApi.getEventRegistrations(eventId);
-            setRegistrations(data);
+            resetRegistrations(await eventApi.getEventRegistrations(eventId));
         } catch (error) {
             console.error("Error loading registrations:", error);
             // Don't show error toast on 403 (if not owner), just fail silently or handle gracefully
@@ -192,7 +191,7 @@ const ManageEventPage = () => {
                                 </TabsTrigger>
                                 <TabsTrigger value="attendees">
                                     <Users className="mr-2 h-4 w-4" />
-                                    Attendees ({registrations.length})
+                                    Attendees ({event.attendee_count ?? registrations.length})
                                 </TabsTrigger>
                             </TabsList>
 
@@ -268,6 +267,11 @@ const ManageEventPage = () => {
                                                 <p>No attendees have registered yet.</p>
                                             </div>
                                         )}
+                                        <LoadMoreButton
+                                            hasMore={hasMoreRegistrations}
+                                            loading={loadingMoreRegistrations}
+                                            onClick={loadMoreRegistrations}
+                                        />
                                     </CardContent>
                                 </Card>
                             </TabsContent>
@@ -3,18 +3,20 @@ import { useState, useEffect } from "react";
 import Navbar from "@/components/Navbar";
 import Footer from "@/components/Footer";
 import EventCard from "@/components/EventCard";
+import LoadMoreButton from "@/components/LoadMoreButton";
 import { Button } from "@/components/ui/button";
 import { Card, CardContent } from "@/components/ui/card";
 import { Tabs, TabsContent, TabsList, TabsTrigger } from "@/components/ui/tabs";
 import { authApi } from "@/api/authApi";
 import { eventApi } from "@/api/eventApi";
+import { useCursorList } from "@/hooks/use-cursor-list";
 import { Event, User } from "@/types/event";
 import { MapPin, Calendar, Edit } from "lucide-react";
 
 const ProfilePage = () => {
   const [user, setUser] = useState<User | null>(null);
-  const [myEvents, setMyEvents] = useState<Event[]>([]);
-  const [attendingEvents, setAttendingEvents] = useState<Event[]>([]);
+  const myEvents = useCursorList<Event>();
+  const attendingEvents = useCursorList<Event>();
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
@@ -25,13 +27,10 @@ const ProfilePage = () => {
         setUser(userData);
 
         // Get user's created events
-        const allEvents = await eventApi.getEvents();
-        const userEvents = allEvents.filter(e => e.created_by.id === userData.id);
-        setMyEvents(userEvents);
+        myEvents.reset(await eventApi.getEvents({ created_by: userData.id }));
 
         // Get events user has registered for
-        const registeredEvents = await eventApi.getRegisteredEvents();
-        setAttendingEvents(registeredEvents);
+        attendingEvents.reset(await eventApi.getRegisteredEvents());
       } catch (error) {
         console.error("Error fetching profile data:", error);
       } finally {
@@ -113,11 +112,15 @@ const ProfilePage = () => {
           <div className="container mx-auto px-4">
             <div className="grid grid-cols-3 gap-4 max-w-2xl">
               <div className="text-center">
-                <div className="text-3xl font-bold text-primary">{myEvents.length}</div>
+                <div className="text-3xl font-bold text-primary">
+                  {myEvents.items.length}{myEvents.hasMore ? "+" : ""}
+                </div>
                 <div className="text-sm text-muted-foreground">Events Created</div>
               </div>
               <div className="text-center">
-                <div className="text-3xl font-bold text-secondary">{attendingEvents.length}</div>
+                <div className="text-3xl font-bold text-secondary">
+                  {attendingEvents.items.length}{attendingEvents.hasMore ? "+" : ""}
+                </div>
                 <div className="text-sm text-muted-foreground">Attending</div>
               </div>
               <div className="text-center">
@@ -145,21 +148,28 @@ const ProfilePage = () => {
 
               {/* My Events Tab */}
               <TabsContent value="my-events" className="space-y-6">
-                {myEvents.length > 0 ? (
-                  <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
-                    {myEvents.map((event) => (
-                      <div key={event.id} className="relative group">
-                        <EventCard event={event} />
-                        <div className="absolute top-2 right-2 opacity-0 group-hover:opacity-100 transition-opacity">
-                          <Button asChild size="sm" variant="secondary" className="shadow-lg">
-                            <a href={`/events/manage/${event.id}`}>
-                              <Edit className="w-4 h-4 mr-1" /> Manage
-                            </a>
-                          </Button>
+                {myEvents.items.length > 0 ? (
+                  <>
+                    <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
+                      {myEvents.items.map((event) => (
+                        <div key={event.id} className="relative group">
+                          <EventCard event={event} />
+                          <div className="absolute top-2 right-2 opacity-0 group-hover:opacity-100 transition-opacity">
+                            <Button asChild size="sm" variant="secondary" className="shadow-lg">
+                              <a href={`/events/manage/${event.id}`}>
+                                <Edit className="w-4 h-4 mr-1" /> Manage
+                              </a>
+                            </Button>
+                          </div>
                         </div>
-                      </div>
-                    ))}
-                  </div>
+                      ))}
+                    </div>
+                    <LoadMoreButton
+                      hasMore={myEvents.hasMore}
+                      loading={myEvents.loadingMore}
+                      onClick={myEvents.loadMore}
+                    />
+                  </>
                 ) : (
                   <Card>
                     <CardContent className="flex flex-col items-center justify-center py-12">
@@ -177,12 +187,19 @@ const ProfilePage = () => {
 
               {/* Attending Tab */}
               <TabsContent value="attending" className="space-y-6">
-                {attendingEvents.length > 0 ? (
-                  <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
-                    {attendingEvents.map((event) => (
-                      <EventCard key={event.id} event={event} />
-                    ))}
-                  </div>
+                {attendingEvents.items.length > 0 ? (
+                  <>
+                    <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
+                      {attendingEvents.items.map((event) => (
+                        <EventCard key={event.id} event={event} />
+                      ))}
+                    </div>
+                    <LoadMoreButton
+                      hasMore={attendingEvents.hasMore}
+                      loading={attendingEvents.loadingMore}
+                      onClick={attendingEvents.loadMore}
+                    />
+                  </>
                 ) : (
                   <Card>
                     <CardContent className="flex flex-col items-center justify-center py-12">
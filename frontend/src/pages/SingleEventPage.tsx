@@ -102,11 +102,19 @@ const SingleEventPage = () => {
             <CardContent className="p-6">
               {/* Event Image */}
               {event.image && (
-                <img
-                  src={event.image}
-                  alt={event.title}
-                  className="w-full h-64 object-cover rounded-lg mb-6"
-                />
+                <picture>
+                  {event.image_srcset?.avif && (
+                    <source type="image/avif" srcSet={event.image_srcset.avif} sizes="(min-width: 896px) 896px, 100vw" />
+                  )}
+                  {event.image_srcset?.webp && (
+                    <source type="image/webp" srcSet={event.image_srcset.webp} sizes="(min-width: 896px) 896px, 100vw" />
+                  )}
+                  <img
+                    src={event.image}
+                    alt={event.title}
+                    className="w-full h-64 object-cover rounded-lg mb-6"
+                  />
+                </picture>
               )}
 
               {/* Event Title and Category */}
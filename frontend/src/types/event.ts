@@ -27,12 +27,22 @@ export interface Event {
   date: string;
   created_by: User;
   image: string;
+  // srcset strings keyed by format ("webp", "avif")
+  image_srcset?: Record<string, string>;
+  thumbnail?: string | null;
   views: number;
   created_at: string;
   is_attending?: boolean;
   attendee_count?: number;
 }
 
+// Cursor-paginated list response from the events API
+export interface CursorPage<T> {
+  next: string | null;
+  previous: string | null;
+  results: T[];
+}
+
 export interface Ticket {
   id: number;
   event: number;